@@ -2,19 +2,25 @@
 from __future__ import annotations
 
 import logging
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_HOST, CONF_PORT, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
     DOMAIN,
     DATA_COORDINATOR,
     DATA_CONFIG,
-    DEFAULT_PORT
+    DATA_PARKED_COORDINATORS,
+    DEFAULT_PORT,
+    RELOAD_GRACE_PERIOD,
 )
 from .coordinator import SmartHomeDataUpdateCoordinator
 from .services import async_setup_services, async_unload_services
+from .snapshot import async_remove_snapshots
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,20 +31,43 @@ PLATFORMS: list[Platform] = [
     Platform.COVER,
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
+    Platform.EVENT,
 ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Smart Home from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-
-    coordinator = SmartHomeDataUpdateCoordinator(
-        hass,
-        config=entry.data,
-        entry_id=entry.entry_id,
-    )
-
-    await coordinator.async_config_entry_first_refresh()
+    start = time.monotonic()
+
+    # Reuse the connection and cached states kept alive by a recent unload
+    coordinator = _async_unpark_coordinator(hass, entry)
+    if coordinator is None:
+        coordinator = SmartHomeDataUpdateCoordinator(
+            hass,
+            config=entry.data,
+            entry_id=entry.entry_id,
+            options=entry.options,
+        )
+    else:
+        _LOGGER.debug("Reusing running connection for %s", entry.title)
+        coordinator.async_update_options(entry.options)
+
+    if not coordinator.effect_map:
+        # Effects are only needed by RGB lights, fetch them alongside the device list
+        # and attach them once they arrive instead of blocking platform setup.
+        entry.async_create_background_task(
+            hass, coordinator.async_fetch_effects(), f"{DOMAIN} {entry.entry_id} effects"
+        )
+
+    if coordinator.data is None or not coordinator.last_update_success:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Keep the WebSocket connection for the retry
+            _async_park_coordinator(hass, entry.entry_id, coordinator)
+            raise
+    refreshed = time.monotonic()
 
     hass.data[DOMAIN][entry.entry_id] = {
         DATA_COORDINATOR: coordinator,
@@ -46,21 +75,94 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    platforms_done = time.monotonic()
 
     # Register services
     await async_setup_services(hass)
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    coordinator.setup_timings.update(
+        first_refresh=refreshed - start,
+        platforms=platforms_done - refreshed,
+        total=time.monotonic() - start,
+    )
+    _LOGGER.debug(
+        "Setup of %s took %.3fs (first refresh %.3fs, platforms %.3fs)",
+        entry.title,
+        coordinator.setup_timings["total"],
+        coordinator.setup_timings["first_refresh"],
+        coordinator.setup_timings["platforms"],
+    )
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
-        await coordinator.async_shutdown()
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)[DATA_COORDINATOR]
+        # Keep the connection running for a while so a reload can pick it up
+        _async_park_coordinator(hass, entry.entry_id, coordinator)
         await async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Clean up after a deleted config entry."""
+    # A deleted entry is never set up again, do not keep its connection parked
+    parked = hass.data.get(DATA_PARKED_COORDINATORS, {})
+    if entry.entry_id in parked:
+        coordinator, cancel_shutdown = parked.pop(entry.entry_id)
+        cancel_shutdown()
+        coordinator.keep_alive = False
+        await coordinator.async_shutdown()
+    await async_remove_snapshots(hass, entry.entry_id)
+
+
+@callback
+def _async_park_coordinator(
+    hass: HomeAssistant, entry_id: str, coordinator: SmartHomeDataUpdateCoordinator
+) -> None:
+    """Keep a coordinator running for RELOAD_GRACE_PERIOD, then shut it down."""
+    parked = hass.data.setdefault(DATA_PARKED_COORDINATORS, {})
+
+    async def _async_shutdown(_now: Any) -> None:
+        """Shut down the coordinator if no setup picked it up."""
+        if parked.get(entry_id, (None,))[0] is coordinator:
+            del parked[entry_id]
+            coordinator.keep_alive = False
+            await coordinator.async_shutdown()
+
+    # The config entry shuts its coordinator down after unloading, skip that
+    coordinator.keep_alive = True
+    parked[entry_id] = (
+        coordinator,
+        async_call_later(hass, RELOAD_GRACE_PERIOD, _async_shutdown),
+    )
+
+
+@callback
+def _async_unpark_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> SmartHomeDataUpdateCoordinator | None:
+    """Return the parked coordinator of an entry if it still matches its config."""
+    parked = hass.data.get(DATA_PARKED_COORDINATORS, {})
+    if entry.entry_id not in parked:
+        return None
+
+    coordinator, cancel_shutdown = parked.pop(entry.entry_id)
+    cancel_shutdown()
+    coordinator.keep_alive = False
+    if coordinator.config != entry.data:
+        hass.async_create_task(coordinator.async_shutdown())
+        return None
+    return coordinator
@@ -24,9 +24,9 @@ async def async_setup_entry(
     coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
     entities = []
-    for device_id, device in coordinator._devices.items():
-        if device["device_type"] == "binary_sensor":
-            if device["module_type"] == "digital":
+    for module_type, device_ids in coordinator.devices_by_type("binary_sensor").items():
+        for device_id in device_ids:
+            if module_type == "digital":
                 # Create two binary sensors for port A and B
                 entities.append(SmartHomeDigitalBinarySensor(coordinator, device_id, "port_a"))
                 entities.append(SmartHomeDigitalBinarySensor(coordinator, device_id, "port_b"))
@@ -47,17 +47,6 @@ class SmartHomeBinarySensor(SmartHomeEntity, BinarySensorEntity):
 class SmartHomeDigitalBinarySensor(SmartHomeEntity, BinarySensorEntity):
     """Representation of a Smart Home digital binary sensor."""
 
-    def __init__(self, coordinator, device_id, port_name):
-        super().__init__(coordinator, device_id)
-        self._port_name = port_name
-        self._attr_name = port_name.replace("_", " ").title()
-        _LOGGER.debug("Initialized digital sensor %s port %s", self.device_data["name"], self.name)
-
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID to use for this entity."""
-        return self.device_data["uuid"] + "_" + self._port_name
-
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
@@ -0,0 +1,273 @@
+"""Direct bindings from controller inputs to outputs."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import PRESS_TYPES
+from .models import SmartHomeDevice
+
+if TYPE_CHECKING:
+    from .coordinator import SmartHomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_SOURCE = "source"
+CONF_SOURCE_PORT = "source_port"
+CONF_TRIGGER = "trigger"
+CONF_TARGET = "target"
+CONF_TARGET_PORT = "target_port"
+CONF_ACTION = "action"
+CONF_DATA = "data"
+
+PORTS = ("port_a", "port_b")
+
+# Triggers on the value of a binary input, next to the pushbutton press types
+TRIGGER_ON = "on"
+TRIGGER_OFF = "off"
+TRIGGER_CHANGE = "change"
+EDGE_TRIGGERS = (TRIGGER_ON, TRIGGER_OFF, TRIGGER_CHANGE)
+
+ACTION_TOGGLE = "toggle"
+ACTION_TURN_ON = "turn_on"
+ACTION_TURN_OFF = "turn_off"
+ACTION_OPEN = "open"
+ACTION_CLOSE = "close"
+ACTION_STOP = "stop"
+ACTION_SET = "set"
+ACTIONS = (
+    ACTION_TOGGLE,
+    ACTION_TURN_ON,
+    ACTION_TURN_OFF,
+    ACTION_OPEN,
+    ACTION_CLOSE,
+    ACTION_STOP,
+    ACTION_SET,
+)
+
+# Blind positions sent for the cover actions
+COVER_POSITIONS = {ACTION_OPEN: 100, ACTION_CLOSE: 0, ACTION_STOP: -1}
+
+BINDING_SCHEMA = vol.Schema({
+    vol.Required(CONF_SOURCE): vol.Coerce(str),
+    vol.Optional(CONF_SOURCE_PORT): vol.In(PORTS),
+    vol.Required(CONF_TRIGGER): vol.In((*PRESS_TYPES, *EDGE_TRIGGERS)),
+    vol.Required(CONF_TARGET): vol.Coerce(str),
+    vol.Optional(CONF_TARGET_PORT): vol.In(PORTS),
+    vol.Required(CONF_ACTION): vol.In(ACTIONS),
+    vol.Optional(CONF_DATA, default={}): dict,
+})
+
+BINDINGS_SCHEMA = vol.All(list, [BINDING_SCHEMA])
+
+
+@dataclass(frozen=True, slots=True)
+class Binding:
+    """One input trigger bound to an output action."""
+
+    source: str
+    source_port: str | None
+    trigger: str
+    target: str
+    target_port: str | None
+    action: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Binding:
+        """Create a binding from a validated options entry."""
+        return cls(
+            source=config[CONF_SOURCE],
+            source_port=config.get(CONF_SOURCE_PORT),
+            trigger=config[CONF_TRIGGER],
+            target=config[CONF_TARGET],
+            target_port=config.get(CONF_TARGET_PORT),
+            action=config[CONF_ACTION],
+            data=config.get(CONF_DATA, {}),
+        )
+
+
+def _is_on(device: SmartHomeDevice, state: dict[str, Any], port: str | None) -> bool:
+    """Return whether an output is currently on according to the cached state."""
+    if device.device_type == "dimmer":
+        return (state.get("value") or 0) > 0
+    if device.module_type == "digital":
+        return bool((state.get("multistate") or {}).get(port or "port_a"))
+    return bool(state.get("state"))
+
+
+def _state_with_command(state: dict[str, Any], command: dict[str, Any]) -> dict[str, Any]:
+    """Return a state with a command applied, as the controller will confirm it."""
+    updated = dict(state)
+    for key, value in command.items():
+        if key in PORTS:
+            updated["multistate"] = {**(state.get("multistate") or {}), key: value}
+        else:
+            updated[key] = value
+    return updated
+
+
+def _state_with_on(
+    device: SmartHomeDevice, state: dict[str, Any], port: str | None, turn_on: bool
+) -> dict[str, Any]:
+    """Return a state with an output switched on or off."""
+    if device.device_type == "dimmer":
+        return {**state, "value": 100 if turn_on else 0}
+    if device.module_type == "digital":
+        return _state_with_command(state, {port or "port_a": turn_on})
+    return {**state, "state": turn_on}
+
+
+def binding_to_command(
+    binding: Binding, device: SmartHomeDevice, state: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Return the PUT payload for a binding's action on its target device."""
+    action = binding.action
+    if action == ACTION_SET:
+        return dict(binding.data) or None
+
+    if device.device_type == "blind":
+        if action not in COVER_POSITIONS:
+            return None
+        return {"position": COVER_POSITIONS[action]}
+    if action in COVER_POSITIONS:
+        return None
+
+    if action == ACTION_TOGGLE:
+        turn_on = not _is_on(device, state, binding.target_port)
+    else:
+        turn_on = action == ACTION_TURN_ON
+
+    if device.device_type == "dimmer":
+        return {"value": binding.data.get("value", 100) if turn_on else 0}
+    if device.module_type == "digital":
+        return {binding.target_port or "port_a": turn_on}
+    return {"state": turn_on}
+
+
+class BindingEngine:
+    """Run bindings straight from the WebSocket ingestion path.
+
+    Triggers are matched when the coordinator processes a frame, and the
+    resulting command goes out over the shared client session without a
+    round trip through the state machine and automation engine. The states
+    reach Home Assistant afterwards through the regular device updates.
+    Replayed frames never reach the engine.
+    """
+
+    def __init__(self, coordinator: SmartHomeDataUpdateCoordinator) -> None:
+        """Initialize the binding engine."""
+        self._coordinator = coordinator
+        self._bindings: dict[tuple[str, str | None, str], list[Binding]] = {}
+        # Last on/off sent per output and when, until the controller confirms it
+        self._pending: dict[tuple[str, str | None], tuple[bool, float]] = {}
+        # Devices with bindings on their value, checked for every frame
+        self.edge_sources: frozenset[str] = frozenset()
+
+    @callback
+    def async_set_bindings(self, configs: list[dict[str, Any]]) -> None:
+        """Replace the bindings with the configured ones."""
+        bindings: dict[tuple[str, str | None, str], list[Binding]] = {}
+        for config in configs:
+            try:
+                binding = Binding.from_config(BINDING_SCHEMA(config))
+            except vol.Invalid as error:
+                _LOGGER.warning("Ignoring invalid binding %s: %s", config, error)
+                continue
+            # Without a source port a binding fires for either port of a digital module
+            ports = (binding.source_port,) if binding.source_port else (None, *PORTS)
+            for port in ports:
+                bindings.setdefault((binding.source, port, binding.trigger), []).append(binding)
+
+        self._bindings = bindings
+        self.edge_sources = frozenset(
+            source for source, _, trigger in bindings if trigger in EDGE_TRIGGERS
+        )
+
+    @callback
+    def async_handle_press(self, device_id: str, port: str | None, press_type: str) -> None:
+        """Run the bindings of a detected pushbutton press."""
+        for binding in self._bindings.get((device_id, port, press_type), ()):
+            self._async_run(binding)
+
+    @callback
+    def async_handle_state(
+        self, device_id: str, old_state: dict[str, Any], new_state: dict[str, Any]
+    ) -> None:
+        """Run the bindings of changed input values of a device."""
+        if "multistate" in new_state:
+            old_ports = old_state.get("multistate") or {}
+            new_ports = new_state["multistate"] or {}
+            for port in PORTS:
+                self._async_handle_edge(device_id, port, old_ports.get(port), new_ports.get(port))
+        else:
+            self._async_handle_edge(device_id, None, old_state.get("state"), new_state.get("state"))
+
+    @callback
+    def _async_handle_edge(
+        self, device_id: str, port: str | None, old: bool | None, new: bool | None
+    ) -> None:
+        """Run the bindings of one changed input value."""
+        # The first state of an input is not an edge
+        if old is None or new is None or bool(new) == bool(old):
+            return
+        for trigger in (TRIGGER_ON if new else TRIGGER_OFF, TRIGGER_CHANGE):
+            for binding in self._bindings.get((device_id, port, trigger), ()):
+                self._async_run(binding)
+
+    @callback
+    def _async_run(self, binding: Binding) -> None:
+        """Send the command of a binding in the background."""
+        coordinator = self._coordinator
+        device = coordinator._devices.get(binding.target)
+        if device is None:
+            _LOGGER.warning("Binding target device %s does not exist", binding.target)
+            return
+
+        state = coordinator._device_states.get(binding.target, {})
+        key = (binding.target, binding.target_port)
+        pending = self._pending.get(key)
+        if pending is not None:
+            turn_on, sent = pending
+            if coordinator._device_state_times.get(binding.target, 0.0) < sent:
+                # Toggle relative to the last command, not the unconfirmed cache
+                state = _state_with_on(device, state, binding.target_port, turn_on)
+            else:
+                del self._pending[key]
+
+        command = binding_to_command(binding, device, state)
+        if command is None:
+            _LOGGER.warning(
+                "Binding action %s is not supported by %s device %s",
+                binding.action, device.device_type, binding.target,
+            )
+            return
+
+        pending = None
+        if device.device_type != "blind" and binding.action != ACTION_SET:
+            turn_on = _is_on(device, _state_with_command(state, command), binding.target_port)
+            pending = self._pending[key] = (turn_on, time.monotonic())
+        coordinator.hass.async_create_task(self._async_send(key, command, pending))
+
+    async def _async_send(
+        self,
+        key: tuple[str, str | None],
+        command: dict[str, Any],
+        pending: tuple[bool, float] | None,
+    ) -> None:
+        """Send a binding command, logging failures."""
+        device_id = key[0]
+        try:
+            await self._coordinator.async_send_command(device_id, command)
+        except HomeAssistantError as error:
+            _LOGGER.warning("Binding command for device %s failed: %s", device_id, error)
+            # The controller never got it, toggle from the cached state again
+            if pending is not None and self._pending.get(key) is pending:
+                del self._pending[key]
@@ -0,0 +1,64 @@
+"""Circuit breaker guarding requests to a controller."""
+from __future__ import annotations
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Track controller health and fail fast while it is unhealthy.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Once
+    ``recovery_timeout`` seconds have passed, a single probe request is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Return False while the controller is considered unhealthy."""
+        return self.state == STATE_CLOSED
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the controller."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back the probe slot of a request that ended without an outcome."""
+        if self.state == STATE_HALF_OPEN:
+            # The recovery timeout has already passed, the next request probes again
+            self.state = STATE_OPEN
+
+    def record_success(self) -> bool:
+        """Record a successful request, return True if the breaker closed."""
+        self.failures = 0
+        if self.state == STATE_CLOSED:
+            return False
+        self.state = STATE_CLOSED
+        return True
+
+    def record_failure(self) -> bool:
+        """Record a failed request, return True if the breaker opened."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
+            return True
+        return False
@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import aiohttp
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -36,8 +35,4 @@ class SmartHomeButton(SmartHomeEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         """Press the button."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"state": True}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to press button: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, {"state": True})
@@ -2,17 +2,55 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 import voluptuous as vol
-import aiohttp
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, DEFAULT_PORT, STEP_USER
+from .bindings import BINDINGS_SCHEMA
+from .const import (
+    CONF_BINDINGS,
+    CONF_CONTROLLER,
+    CONF_GROUPS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEARTBEAT_TIMEOUT,
+    CONF_HOSTS,
+    CONF_RECORD_TRAFFIC,
+    CONF_SKIP_REDUNDANT_COMMANDS,
+    CONF_STATE_MAX_AGE,
+    CONF_TRACE_DEVICES,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HEARTBEAT_TIMEOUT,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DOMAIN,
+    DEFAULT_PORT,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_TIMEOUT,
+    PROBE_TIMEOUT,
+    STEP_DISCOVER,
+    STEP_INIT,
+    STEP_MANUAL,
+    STEP_PICK,
+    STEP_USER,
+)
+from .discovery import (
+    DiscoveredController,
+    async_discover_controllers,
+    async_probe_controller,
+    parse_hosts,
+)
+from .group import GROUPS_SCHEMA, assign_group_ids
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,33 +59,66 @@ class SmartHomeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SmartHomeOptionsFlow:
+        """Get the options flow for this handler."""
+        return SmartHomeOptionsFlow()
+
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, DiscoveredController] = {}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Let the user choose between discovery and manual setup."""
+        return self.async_show_menu(
+            step_id=STEP_USER,
+            menu_options=[STEP_DISCOVER, STEP_MANUAL],
+        )
+
+    async def _async_create_controller_entry(
+        self, name: str, host: str, port: int
+    ) -> FlowResult:
+        """Create the entry of a controller unless it is already configured."""
+        await self.async_set_unique_id(f"{host}:{port}")
+        self._abort_if_unique_id_configured()
+        # Entries created before unique IDs were set are matched on their data
+        self._async_abort_entries_match({CONF_HOST: host, CONF_PORT: port})
+        return self.async_create_entry(
+            title=name,
+            data={CONF_NAME: name, CONF_HOST: host, CONF_PORT: port},
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle manual setup of a single controller."""
         errors = {}
 
         if user_input is not None:
             try:
-                # Test connection to API
-                async with aiohttp.ClientSession() as session:
-                    url = f"http://{user_input[CONF_HOST]}:{user_input[CONF_PORT]}"
-                    async with session.get(f"{url}/") as response:
-                        if response.status == 200:
-                            return self.async_create_entry(
-                                title=user_input[CONF_NAME],
-                                data=user_input,
-                            )
-                        else:
-                            errors["base"] = "cannot_connect"
-            except aiohttp.ClientError:
-                errors["base"] = "cannot_connect"
+                controller = await async_probe_controller(
+                    async_get_clientsession(self.hass),
+                    user_input[CONF_HOST],
+                    user_input[CONF_PORT],
+                    PROBE_TIMEOUT,
+                )
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            else:
+                if controller is not None:
+                    return await self._async_create_controller_entry(
+                        user_input[CONF_NAME], user_input[CONF_HOST], user_input[CONF_PORT]
+                    )
+                errors["base"] = "cannot_connect"
 
         return self.async_show_form(
-            step_id=STEP_USER,
+            step_id=STEP_MANUAL,
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_NAME): str,
@@ -56,4 +127,145 @@ class SmartHomeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+    async def async_step_discover(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Probe a subnet or list of hosts for controllers."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                hosts = parse_hosts(user_input[CONF_HOSTS], DISCOVERY_MAX_HOSTS)
+            except ValueError:
+                errors[CONF_HOSTS] = "invalid_hosts"
+            else:
+                start = time.monotonic()
+                controllers = await async_discover_controllers(
+                    async_get_clientsession(self.hass),
+                    hosts,
+                    user_input[CONF_PORT],
+                    DISCOVERY_TIMEOUT,
+                    DISCOVERY_CONCURRENCY,
+                )
+                _LOGGER.debug(
+                    "Probed %d hosts in %.1fs, found %d controllers",
+                    len(hosts), time.monotonic() - start, len(controllers),
+                )
+                configured = self._async_current_ids()
+                self._discovered = {
+                    controller.key: controller
+                    for controller in controllers
+                    if controller.key not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_controllers_found"
+
+        return self.async_show_form(
+            step_id=STEP_DISCOVER,
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOSTS): str,
+                    vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick one of the discovered controllers."""
+        if user_input is not None:
+            controller = self._discovered[user_input[CONF_CONTROLLER]]
+            return await self._async_create_controller_entry(
+                user_input[CONF_NAME], controller.host, controller.port
+            )
+
+        return self.async_show_form(
+            step_id=STEP_PICK,
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CONTROLLER): vol.In({
+                        key: f"{key} ({controller.devices} devices, {controller.latency_ms} ms)"
+                        for key, controller in sorted(self._discovered.items())
+                    }),
+                    vol.Required(CONF_NAME): str,
+                }
+            ),
+        )
+
+
+class SmartHomeOptionsFlow(config_entries.OptionsFlow):
+    """Handle Smart Home options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_HEARTBEAT_TIMEOUT] >= user_input[CONF_HEARTBEAT_INTERVAL]:
+                errors[CONF_HEARTBEAT_TIMEOUT] = "timeout_exceeds_interval"
+            try:
+                user_input[CONF_BINDINGS] = BINDINGS_SCHEMA(user_input.get(CONF_BINDINGS) or [])
+            except vol.Invalid:
+                errors[CONF_BINDINGS] = "invalid_bindings"
+            try:
+                user_input[CONF_GROUPS] = assign_group_ids(
+                    GROUPS_SCHEMA(user_input.get(CONF_GROUPS) or []),
+                    self.config_entry.options.get(CONF_GROUPS, []),
+                )
+            except vol.Invalid:
+                errors[CONF_GROUPS] = "invalid_groups"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id=STEP_INIT,
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_RECORD_TRAFFIC,
+                        default=options.get(CONF_RECORD_TRAFFIC, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=2, max=300)),
+                    vol.Optional(
+                        CONF_HEARTBEAT_TIMEOUT,
+                        default=options.get(CONF_HEARTBEAT_TIMEOUT, DEFAULT_HEARTBEAT_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=299)),
+                    vol.Optional(
+                        CONF_SKIP_REDUNDANT_COMMANDS,
+                        default=options.get(CONF_SKIP_REDUNDANT_COMMANDS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_STATE_MAX_AGE,
+                        default=options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Optional(
+                        CONF_TRACE_SAMPLE_RATE,
+                        default=options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                    vol.Optional(
+                        CONF_TRACE_DEVICES,
+                        default=options.get(CONF_TRACE_DEVICES, []),
+                    ): selector.TextSelector(selector.TextSelectorConfig(multiple=True)),
+                    vol.Optional(
+                        CONF_BINDINGS,
+                        default=options.get(CONF_BINDINGS, []),
+                    ): selector.ObjectSelector(),
+                    vol.Optional(
+                        CONF_GROUPS,
+                        default=options.get(CONF_GROUPS, []),
+                    ): selector.ObjectSelector(),
+                }
+            ),
+            errors=errors,
+        )
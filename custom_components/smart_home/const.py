@@ -11,7 +11,88 @@ DEFAULT_PORT: Final = 5000
 
 # Config flow and options flow
 STEP_USER: Final = "user"
+STEP_INIT: Final = "init"
+STEP_MANUAL: Final = "manual"
+STEP_DISCOVER: Final = "discover"
+STEP_PICK: Final = "pick"
 
 DATA_COORDINATOR: Final = "coordinator"
 DATA_CONFIG: Final = "config"
 
+# Storage
+STORAGE_VERSION: Final = 1
+
+# Maximum number of concurrent state PUTs sent to one controller
+MAX_CONCURRENT_COMMANDS: Final = 10
+
+# Pushbutton press detection
+EVENT_PUSHBUTTON: Final = f"{DOMAIN}_pushbutton"
+PRESS_TYPE_PRESS: Final = "press"
+PRESS_TYPE_SHORT: Final = "short_press"
+PRESS_TYPE_LONG: Final = "long_press"
+PRESS_TYPE_DOUBLE: Final = "double_press"
+PRESS_TYPES: Final = [PRESS_TYPE_PRESS, PRESS_TYPE_SHORT, PRESS_TYPE_LONG, PRESS_TYPE_DOUBLE]
+LONG_PRESS_DELAY: Final = 0.5  # seconds
+DOUBLE_PRESS_WINDOW: Final = 0.3  # seconds
+
+# Request timeouts (seconds)
+COMMAND_TIMEOUT: Final = 5
+POLL_TIMEOUT: Final = 10
+EFFECTS_TIMEOUT: Final = 10
+PROBE_TIMEOUT: Final = 5
+
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_RECOVERY_TIMEOUT: Final = 30  # seconds
+
+# Options
+CONF_RECORD_TRAFFIC: Final = "record_traffic"
+
+# Traffic recorder
+RECORDER_MAX_BYTES: Final = 10 * 1024 * 1024
+RECORDER_BACKUP_COUNT: Final = 3
+
+# WebSocket heartbeat
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
+CONF_HEARTBEAT_TIMEOUT: Final = "heartbeat_timeout"
+DEFAULT_HEARTBEAT_INTERVAL: Final = 5  # seconds
+DEFAULT_HEARTBEAT_TIMEOUT: Final = 3  # seconds
+WS_RECONNECT_DELAY: Final = 2  # seconds
+
+# Skipping commands that match the confirmed state, as long as the WebSocket
+# link showed signs of life within the max age
+CONF_SKIP_REDUNDANT_COMMANDS: Final = "skip_redundant_commands"
+CONF_STATE_MAX_AGE: Final = "state_max_age"
+DEFAULT_STATE_MAX_AGE: Final = 60  # seconds
+
+# Coordinators kept running between unload and setup of the same entry
+DATA_PARKED_COORDINATORS: Final = f"{DOMAIN}_parked_coordinators"
+DATA_PROFILE_RUN: Final = f"{DOMAIN}_profile_run"
+RELOAD_GRACE_PERIOD: Final = 60  # seconds
+
+# Rolling sensor statistics
+STATISTICS_MAX_SAMPLES: Final = 720
+STATISTICS_MAX_AGE: Final = 3600  # seconds
+
+# Direct bindings from inputs to outputs
+CONF_BINDINGS: Final = "bindings"
+
+# Groups of lights and switches exposed as one light
+CONF_GROUPS: Final = "groups"
+
+# Sampled trace events
+CONF_TRACE_SAMPLE_RATE: Final = "trace_sample_rate"
+CONF_TRACE_DEVICES: Final = "trace_devices"
+DEFAULT_TRACE_SAMPLE_RATE: Final = 0.0
+TRACE_BUFFER_SIZE: Final = 1000
+
+# Controller discovery in the config flow
+CONF_HOSTS: Final = "hosts"
+CONF_CONTROLLER: Final = "controller"
+DISCOVERY_TIMEOUT: Final = 2  # seconds per host
+DISCOVERY_CONCURRENCY: Final = 64
+DISCOVERY_MAX_HOSTS: Final = 1024
+
+# Client-side light transitions
+TRANSITION_TICK: Final = 0.1  # seconds
+TRANSITION_MAX_STEPS_PER_SECOND: Final = 50  # per controller
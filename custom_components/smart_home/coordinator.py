@@ -4,25 +4,78 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from collections.abc import Callable, Mapping
 from datetime import timedelta
+from functools import partial
 from typing import Any
 
 import aiohttp
+import async_timeout
 import websocket
 import threading
+import time
 
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.const import CONF_HOST, CONF_PORT
 
-from .const import DOMAIN
+from .bindings import BindingEngine
+from .breaker import CircuitBreaker
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIMEOUT,
+    COMMAND_TIMEOUT,
+    CONF_BINDINGS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEARTBEAT_TIMEOUT,
+    CONF_RECORD_TRAFFIC,
+    CONF_SKIP_REDUNDANT_COMMANDS,
+    CONF_STATE_MAX_AGE,
+    CONF_TRACE_DEVICES,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HEARTBEAT_TIMEOUT,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DOMAIN,
+    EFFECTS_TIMEOUT,
+    EVENT_PUSHBUTTON,
+    MAX_CONCURRENT_COMMANDS,
+    POLL_TIMEOUT,
+    RECORDER_BACKUP_COUNT,
+    RECORDER_MAX_BYTES,
+    TRACE_BUFFER_SIZE,
+    WS_RECONNECT_DELAY,
+)
+from .models import SmartHomeDevice, merge_state
+from .press import PushbuttonPressDetector
+from .profiler import (
+    SECTION_COMMAND,
+    SECTION_STATE_UPDATE,
+    SECTION_WS_DECODE,
+    SmartHomeProfiler,
+)
+from .snapshot import SmartHomeSnapshots
+from .trace import (
+    TRACE_COMMAND_ACKED,
+    TRACE_COMMAND_FAILED,
+    TRACE_COMMAND_SENT,
+    TRACE_DISPATCHED,
+    TRACE_FRAME_RECEIVED,
+    SmartHomeTracer,
+)
+from .traffic import RECORD_REST, RECORD_WS, TrafficRecorder
+from .transition import TransitionEngine
 
 _LOGGER = logging.getLogger(__name__)
 
+
 class SmartHomeDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
@@ -32,16 +85,51 @@ class SmartHomeDataUpdateCoordinator(DataUpdateCoordinator):
         *,
         config: dict[str, Any],
         entry_id: str,
+        options: Mapping[str, Any] | None = None,
     ) -> None:
         """Initialize."""
         self.config = config
+        self.options = options or {}
         self.api_url = f"http://{config[CONF_HOST]}:{config[CONF_PORT]}"
         self.ws_url = f"ws://{config[CONF_HOST]}:{config[CONF_PORT]}/ws"
         self.ws = None
         self.ws_thread = None
+        self._ws_stop = threading.Event()
         self.entry_id = entry_id
-        self._devices = {}
+        self._devices: dict[str, SmartHomeDevice] = {}
         self._device_states = {}
+        # Monotonic time at which each device state was last confirmed by the controller
+        self._device_state_times: dict[str, float] = {}
+        # Monotonic time the WebSocket link came up, None while it is down. The
+        # controller pushes every change over the link, so a state received since
+        # then stays current for as long as the link lives.
+        self._ws_link_since: float | None = None
+        # Monotonic time of the last sign of life on the link (open, frame or pong)
+        self._ws_last_seen = 0.0
+        self._device_index: dict[str, dict[str, list[str]]] = {}
+        self.effect_map: dict[str, str] = {}
+        self.setup_timings: dict[str, float] = {}
+        self.stats: dict[str, float] = {
+            "state_writes": 0,
+            "state_writes_skipped": 0,
+            "commands_sent": 0,
+            "commands_skipped": 0,
+            "transition_steps": 0,
+            "ws_connects": 0,
+            "ws_rtt_ms": 0.0,
+        }
+        self._command_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT)
+        self._probe_unsub: Callable[[], None] | None = None
+        self.profiler: SmartHomeProfiler | None = None
+        # Set while the coordinator outlives an unload of its config entry
+        self.keep_alive = False
+        self.recorder: TrafficRecorder | None = None
+        self.replay_task: asyncio.Task | None = None
+        self.tracer: SmartHomeTracer | None = None
+        self._press_detectors: dict[tuple[str, str | None], PushbuttonPressDetector] = {}
+        self._press_listeners: dict[tuple[str, str | None], list[Callable[[str], None]]] = {}
+        self._device_listeners: dict[str, list[Callable[[], None]]] = {}
 
         super().__init__(
             hass,
@@ -50,60 +138,472 @@ class SmartHomeDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=30),  # Fallback update interval
         )
 
+        self.snapshots = SmartHomeSnapshots(hass, self)
+        self.bindings = BindingEngine(self)
+        self.transitions = TransitionEngine(self)
+        self.async_update_options(self.options)
+
         self._start_ws_client()
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @callback
+    def async_update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply (changed) config entry options to the running coordinator."""
+        heartbeat_changed = any(
+            options.get(key) != self.options.get(key)
+            for key in (CONF_HEARTBEAT_INTERVAL, CONF_HEARTBEAT_TIMEOUT)
+        )
+        trace_changed = any(
+            options.get(key) != self.options.get(key)
+            for key in (CONF_TRACE_SAMPLE_RATE, CONF_TRACE_DEVICES)
+        )
+        self.options = options
+        self._skip_redundant_commands = options.get(CONF_SKIP_REDUNDANT_COMMANDS, False)
+        self._state_max_age = options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE)
+        self.bindings.async_set_bindings(options.get(CONF_BINDINGS, []))
+
+        if options.get(CONF_RECORD_TRAFFIC, False):
+            if self.recorder is None:
+                self.recorder = TrafficRecorder(
+                    self.hass.config.path(f"{DOMAIN}_{self.entry_id}_traffic.jsonl"),
+                    RECORDER_MAX_BYTES,
+                    RECORDER_BACKUP_COUNT,
+                )
+        elif self.recorder is not None:
+            self.hass.async_add_executor_job(self.recorder.close)
+            self.recorder = None
+
+        sample_rate = options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE)
+        if sample_rate <= 0:
+            self.tracer = None
+        elif trace_changed or self.tracer is None:
+            self.tracer = SmartHomeTracer(
+                TRACE_BUFFER_SIZE, sample_rate, options.get(CONF_TRACE_DEVICES)
+            )
+
+        if heartbeat_changed and self.ws:
+            # The client thread reconnects with the new heartbeat settings
+            self.ws.close()
+
+    async def _async_update_data(self) -> dict[str, SmartHomeDevice]:
         """Update data via library."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.api_url}/api/devices") as response:
+            devices = await self._async_request("GET", "/api/devices", POLL_TIMEOUT)
+        except HomeAssistantError as error:
+            raise UpdateFailed(f"Error communicating with API: {error}") from error
+
+        recorder = self.recorder
+        if recorder is not None:
+            self.hass.async_add_executor_job(recorder.record, RECORD_REST, devices)
+
+        return self._async_update_devices(devices)
+
+    @callback
+    def _async_update_devices(self, devices: list[dict[str, Any]]) -> dict[str, SmartHomeDevice]:
+        """Update the device cache and the type index used by the platforms."""
+        new_devices: dict[str, SmartHomeDevice] = {}
+        device_index: dict[str, dict[str, list[str]]] = {}
+        for data in devices:
+            if not data["enabled"]:
+                continue
+            device = SmartHomeDevice.from_api(data)
+            # Keep the previous record when nothing changed so entities can
+            # detect metadata changes by identity
+            previous = self._devices.get(device.id)
+            if previous == device:
+                device = previous
+            new_devices[device.id] = device
+            device_index.setdefault(device.device_type, {}).setdefault(
+                device.module_type, []
+            ).append(device.id)
+        self._devices = new_devices
+        self._device_index = device_index
+        return self._devices
+
+    def devices_by_type(self, device_type: str) -> dict[str, list[str]]:
+        """Return the ids of all devices of a type, grouped by module type."""
+        return self._device_index.get(device_type, {})
+
+    @property
+    def controller_available(self) -> bool:
+        """Return False while the circuit breaker considers the controller unhealthy."""
+        return self.breaker.available
+
+    async def _async_request(self, method: str, path: str, timeout: float, **kwargs: Any) -> Any:
+        """Send a request to the controller, guarded by timeout and circuit breaker."""
+        if not self.breaker.allow_request():
+            raise HomeAssistantError(f"Controller at {self.api_url} is unavailable")
+
+        session = async_get_clientsession(self.hass)
+        # Every request that got past the breaker records an outcome or gives back its
+        # probe slot, so a half-open breaker can never get stuck
+        healthy = False
+        cancelled = False
+        try:
+            async with async_timeout.timeout(timeout):
+                async with session.request(method, f"{self.api_url}{path}", **kwargs) as response:
+                    if response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
                     if response.status != 200:
-                        raise UpdateFailed(f"Error communicating with API: {response.status}")
-                    devices = await response.json()
-                    
-                    # Update internal device cache
-                    new_devices = {}
-                    for device in devices:
-                        if not device["enabled"]:
-                            continue
-                        new_devices[str(device["id"])] = device
-                    self._devices = new_devices
-                    return self._devices
-                    
-        except aiohttp.ClientError as error:
-            raise UpdateFailed(f"Error communicating with API: {error}")
+                        healthy = True
+                        raise HomeAssistantError(f"{method} {path} failed: {response.status}")
+                    data = await response.json() if method == "GET" else None
+            healthy = True
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as error:
+            raise HomeAssistantError(
+                f"Error communicating with controller at {self.api_url}: {str(error) or 'timeout'}"
+            ) from error
+        except asyncio.CancelledError:
+            # Cancelled calls, fade steps and shutdown say nothing about the controller
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                self.breaker.release()
+            elif healthy:
+                self._async_record_success()
+            else:
+                self._async_record_failure()
+
+        return data
+
+    @callback
+    def _async_record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self.breaker.record_success():
+            _LOGGER.info("Controller at %s is available again", self.api_url)
+            self.async_update_listeners()
 
     @callback
-    def async_device_state_update(self, msg: dict[str, Any]) -> None:
+    def _async_record_failure(self) -> None:
+        """Open the breaker when the controller keeps failing and schedule a probe."""
+        if not self.breaker.record_failure():
+            return
+
+        _LOGGER.warning(
+            "Controller at %s is unavailable, retrying in %ss",
+            self.api_url, self.breaker.recovery_timeout,
+        )
+        self.async_update_listeners()
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+        self._probe_unsub = async_call_later(
+            self.hass, self.breaker.recovery_timeout, self._async_probe
+        )
+
+    async def _async_probe(self, _now: Any) -> None:
+        """Probe the controller half-open by refreshing the device list."""
+        self._probe_unsub = None
+        await self.async_request_refresh()
+
+    async def async_fetch_effects(self) -> None:
+        """Fetch available effects from API and hand them to the lights."""
+        start = time.monotonic()
+        try:
+            effect_map = await self._async_request("GET", "/api/effects", EFFECTS_TIMEOUT)
+        except HomeAssistantError as error:
+            _LOGGER.error("Error fetching effects: %s", error)
+            return
+        finally:
+            self.setup_timings["effects"] = time.monotonic() - start
+
+        _LOGGER.debug("Fetched effects: %s", effect_map)
+        self.effect_map = effect_map
+        self.async_update_listeners()
+
+    def _command_matches_state(self, device_id: str, data: dict[str, Any]) -> bool:
+        """Return True if a command would not change the state confirmed over the live link."""
+        link_since = self._ws_link_since
+        confirmed = self._device_state_times.get(device_id)
+        if link_since is None or confirmed is None or confirmed < link_since:
+            return False
+        if time.monotonic() - self._ws_last_seen > self._state_max_age:
+            return False
+
+        state = self._device_states.get(device_id, {})
+        for key, value in data.items():
+            if key in ("port_a", "port_b"):
+                current = (state.get("multistate") or {}).get(key)
+            elif key == "position" and value == -1:
+                # Stopping a blind is never redundant
+                return False
+            else:
+                current = state.get(key)
+            if current is None or current != value:
+                return False
+        return True
+
+    async def async_send_command(self, device_id: str, data: dict[str, Any]) -> None:
+        """Send a state change to a single device over the shared session."""
+        # A new command takes over from a running transition, after its last step
+        step = self.transitions.async_cancel(device_id)
+        if step is not None:
+            await asyncio.wait((step,))
+
+        if self._skip_redundant_commands and self._command_matches_state(device_id, data):
+            _LOGGER.debug("Skipping command for device %s matching its state: %s", device_id, data)
+            self.stats["commands_skipped"] += 1
+            return
+
+        self.stats["commands_sent"] += 1
+        await self._async_put_state(device_id, data)
+
+    async def _async_put_state(self, device_id: str, data: dict[str, Any]) -> None:
+        """PUT a device state, bounded by the command concurrency limit."""
+        # The cached state no longer counts as confirmed until the controller echoes
+        # the result, so a quick follow-up command is never skipped against it
+        self._device_state_times.pop(device_id, None)
+        profiler = self.profiler
+        tracer = self.tracer
+        trace_id = tracer.start(device_id) if tracer is not None else None
+        if trace_id is not None:
+            tracer.add(trace_id, TRACE_COMMAND_SENT, device_id, {"data": data})
+        start = time.perf_counter() if profiler is not None or trace_id is not None else 0.0
+        try:
+            async with self._command_semaphore:
+                await self._async_request(
+                    "PUT", f"/api/devices/{device_id}/state", COMMAND_TIMEOUT, json=data
+                )
+        except HomeAssistantError as error:
+            if trace_id is not None:
+                tracer.add(trace_id, TRACE_COMMAND_FAILED, device_id, {"error": str(error)})
+            raise
+        elapsed = time.perf_counter() - start
+        if trace_id is not None:
+            tracer.add(trace_id, TRACE_COMMAND_ACKED, device_id, {"ms": round(elapsed * 1000, 1)})
+        if profiler is not None:
+            profiler.add(SECTION_COMMAND, elapsed, device_id)
+
+    @callback
+    def _async_assume_state(self, device_id: str, data: dict[str, Any]) -> None:
+        """Merge a sent command into the cached state ahead of its echo."""
+        self._device_states[device_id] = merge_state(self._device_states.get(device_id, {}), data)
+
+    async def async_send_commands(self, commands: dict[str, dict[str, Any]]) -> dict[str, bool]:
+        """Send state changes to several devices concurrently."""
+        device_ids = list(commands)
+        results = await asyncio.gather(
+            *(self.async_send_command(device_id, commands[device_id]) for device_id in device_ids),
+            return_exceptions=True,
+        )
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Failed to update device %s: %s", device_id, result)
+        return {
+            device_id: not isinstance(result, Exception)
+            for device_id, result in zip(device_ids, results)
+        }
+
+    @callback
+    def async_device_state_update(self, msg: dict[str, Any], trace_id: int | None = None) -> None:
         """Process device state update from WebSocket."""
-        if msg["type"] == "device_update":
+        tracer = self.tracer
+        if trace_id is None or tracer is None:
+            self._async_profile_message(msg)
+            return
+
+        # Entities tag their state writes with the trace of the frame being dispatched
+        tracer.current = trace_id
+        try:
+            self._async_profile_message(msg)
+        finally:
+            tracer.current = None
+
+    @callback
+    def _async_profile_message(self, msg: dict[str, Any]) -> None:
+        """Process a WebSocket message, timing it while profiling."""
+        profiler = self.profiler
+        if profiler is None:
+            self._async_process_message(msg)
+            return
+
+        start = time.perf_counter()
+        self._async_process_message(msg)
+        device_id = str(msg["device_id"]) if "device_id" in msg else None
+        profiler.add(SECTION_STATE_UPDATE, time.perf_counter() - start, device_id)
+
+    @callback
+    def _async_process_message(self, msg: dict[str, Any]) -> None:
+        """Apply a WebSocket message to the cached device states."""
+        if msg["type"] in ("device_update", "device_delta"):
             device_id = str(msg["device_id"])
-            if device_id in self._devices:
-                self._device_states[device_id] = msg["state"]
-                self.async_set_updated_data(self._devices)
+            device = self._devices.get(device_id)
+            if device is not None:
+                # Updates may be partial, merge them into the cached state
+                old_state = self._device_states.get(device_id, {})
+                new_state = merge_state(old_state, msg["state"])
+                if device.device_type == "pushbutton":
+                    # Detect presses before the state fan-out so events fire with minimal latency
+                    self._async_detect_presses(device_id, device, old_state, new_state)
+                if device_id in self.bindings.edge_sources:
+                    self.bindings.async_handle_state(device_id, old_state, new_state)
+                self._device_states[device_id] = new_state
+                self._device_state_times[device_id] = time.monotonic()
+                # Only the entities of this device need to re-evaluate their state
+                listeners = self._device_listeners.get(device_id, ())
+                tracer = self.tracer
+                if tracer is not None and tracer.current is not None:
+                    tracer.add(tracer.current, TRACE_DISPATCHED, device_id, {"listeners": len(listeners)})
+                for listener in listeners:
+                    listener()
         elif msg["type"] == "initial_states":
+            now = time.monotonic()
             for state in msg["states"]:
                 device_id = str(state["device_id"])
                 self._device_states[device_id] = state["state"]
+                self._device_state_times[device_id] = now
             self.async_set_updated_data(self._devices)
 
-    def _ws_connect(self) -> None:
-        """Connect to WebSocket in a separate thread."""
-        _LOGGER.info("Connecting to WebSocket")
-        websocket.enableTrace(True)
-        self.ws = websocket.WebSocketApp(
-            self.ws_url,
-            on_message=self._ws_message,
-            on_error=self._ws_error,
-            on_close=self._ws_close,
+    @callback
+    def _async_detect_presses(
+        self,
+        device_id: str,
+        device: SmartHomeDevice,
+        old_state: dict[str, Any],
+        new_state: dict[str, Any],
+    ) -> None:
+        """Feed pushbutton press and release edges into the press detectors."""
+        if device.module_type == "digital":
+            old_ports = old_state.get("multistate") or {}
+            new_ports = new_state.get("multistate") or {}
+            for port in ("port_a", "port_b"):
+                self._async_process_press_edge(device_id, port, old_ports.get(port), new_ports.get(port))
+        else:
+            self._async_process_press_edge(device_id, None, old_state.get("state"), new_state.get("state"))
+
+    @callback
+    def _async_process_press_edge(
+        self, device_id: str, port: str | None, old: bool | None, new: bool | None
+    ) -> None:
+        """Pass a changed pushbutton value to its press detector."""
+        if new is None or bool(new) == bool(old):
+            return
+
+        key = (device_id, port)
+        detector = self._press_detectors.get(key)
+        if detector is None:
+            detector = self._press_detectors[key] = PushbuttonPressDetector(
+                self.hass.loop, partial(self._async_fire_press, device_id, port)
+            )
+
+        if new:
+            detector.async_press()
+        else:
+            detector.async_release()
+
+    @callback
+    def _async_fire_press(self, device_id: str, port: str | None, press_type: str) -> None:
+        """Run bindings and notify event entities and the event bus about a pushbutton press."""
+        self.bindings.async_handle_press(device_id, port, press_type)
+        for listener in self._press_listeners.get((device_id, port), ()):
+            listener(press_type)
+
+        device = self._devices.get(device_id)
+        self.hass.bus.async_fire(
+            EVENT_PUSHBUTTON,
+            {
+                "device_id": device_id,
+                "uuid": device.uuid if device else None,
+                "port": port,
+                "type": press_type,
+            },
         )
-        self.ws.run_forever()
+
+    @callback
+    def async_add_device_listener(
+        self, device_id: str, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for WebSocket state updates of a single device."""
+        self._device_listeners.setdefault(device_id, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the device listener."""
+            self._device_listeners[device_id].remove(update_callback)
+            if not self._device_listeners[device_id]:
+                del self._device_listeners[device_id]
+
+        return remove_listener
+
+    @callback
+    def async_add_press_listener(
+        self, device_id: str, port: str | None, press_callback: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Listen for presses of a pushbutton (or one of its ports)."""
+        key = (device_id, port)
+        self._press_listeners.setdefault(key, []).append(press_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the press listener."""
+            self._press_listeners[key].remove(press_callback)
+            if not self._press_listeners[key]:
+                del self._press_listeners[key]
+
+        return remove_listener
+
+    def _ws_connect(self) -> None:
+        """Connect to WebSocket in a separate thread, reconnecting until shutdown."""
+        while not self._ws_stop.is_set():
+            interval = self.options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+            timeout = min(
+                self.options.get(CONF_HEARTBEAT_TIMEOUT, DEFAULT_HEARTBEAT_TIMEOUT), interval - 1
+            )
+            _LOGGER.info("Connecting to WebSocket")
+            self.ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._ws_open,
+                on_message=self._ws_message,
+                on_error=self._ws_error,
+                on_close=self._ws_close,
+                on_pong=self._ws_pong,
+            )
+            # A missing pong within the timeout closes the socket, so a silent
+            # half-open connection is replaced within interval + timeout seconds
+            self.ws.run_forever(ping_interval=interval, ping_timeout=timeout)
+            if self._ws_stop.wait(WS_RECONNECT_DELAY):
+                break
+
+    def _ws_open(self, _) -> None:
+        """Handle WebSocket open by resyncing the device list."""
+        _LOGGER.info("WebSocket connected")
+        self._ws_link_since = self._ws_last_seen = time.monotonic()
+        self.stats["ws_connects"] += 1
+        self.hass.add_job(self.async_request_refresh)
+
+    def _ws_pong(self, ws: websocket.WebSocketApp, _data: Any) -> None:
+        """Track the heartbeat round-trip time."""
+        self._ws_last_seen = time.monotonic()
+        self.stats["ws_rtt_ms"] = round((ws.last_pong_tm - ws.last_ping_tm) * 1000, 1)
 
     def _ws_message(self, _, message: str) -> None:
         """Handle incoming WebSocket message."""
+        self._ws_last_seen = time.monotonic()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(RECORD_WS, message)
         try:
-            msg = json.loads(message)
-            self.hass.add_job(self.async_device_state_update, msg)
+            profiler = self.profiler
+            if profiler is None:
+                msg = json.loads(message)
+            else:
+                start = time.perf_counter()
+                msg = json.loads(message)
+                profiler.add(SECTION_WS_DECODE, time.perf_counter() - start)
+            tracer = self.tracer
+            trace_id = None
+            if tracer is not None:
+                device_id = str(msg["device_id"]) if "device_id" in msg else None
+                trace_id = tracer.start(device_id)
+                if trace_id is not None:
+                    tracer.add(
+                        trace_id,
+                        TRACE_FRAME_RECEIVED,
+                        device_id,
+                        {"type": msg.get("type"), "bytes": len(message)},
+                    )
+            self.hass.add_job(self.async_device_state_update, msg, trace_id)
         except json.JSONDecodeError:
             _LOGGER.error("Failed to parse WebSocket message")
 
@@ -113,9 +613,9 @@ class SmartHomeDataUpdateCoordinator(DataUpdateCoordinator):
 
     def _ws_close(self, *args: Any) -> None:
         """Handle WebSocket close."""
-        _LOGGER.warning("WebSocket connection closed")
-        # Attempt to reconnect after a delay
-        self.hass.loop.call_later(30, self._start_ws_client)
+        self._ws_link_since = None
+        if not self._ws_stop.is_set():
+            _LOGGER.warning("WebSocket connection closed, reconnecting in %ss", WS_RECONNECT_DELAY)
 
     def _start_ws_client(self) -> None:
         """Start WebSocket client in a separate thread."""
@@ -128,6 +628,20 @@ class SmartHomeDataUpdateCoordinator(DataUpdateCoordinator):
         self.ws_thread.start()
 
     async def async_shutdown(self) -> None:
-        """Shutdown the coordinator."""
+        """Shutdown the coordinator, unless it is kept running for a reload."""
+        if self.keep_alive:
+            return
+        await super().async_shutdown()
+        for detector in self._press_detectors.values():
+            detector.async_cancel()
+        self.transitions.async_stop()
+        if self.replay_task is not None:
+            self.replay_task.cancel()
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+            self._probe_unsub = None
+        if self.recorder is not None:
+            await self.hass.async_add_executor_job(self.recorder.close)
+        self._ws_stop.set()
         if self.ws:
             self.ws.close()
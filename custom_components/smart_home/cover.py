@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import aiohttp
 from homeassistant.components.cover import (
     CoverEntity,
     CoverEntityFeature,
@@ -28,8 +27,8 @@ async def async_setup_entry(
     coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
     entities = []
-    for device_id, device in coordinator._devices.items():
-        if device["device_type"] == "blind":
+    for device_ids in coordinator.devices_by_type("blind").values():
+        for device_id in device_ids:
             entities.append(SmartHomeCover(coordinator, device_id))
 
     async_add_entities(entities)
@@ -46,44 +45,32 @@ class SmartHomeCover(SmartHomeEntity, CoverEntity):
         super().__init__(coordinator, device_id)
         
         # Set supported features based on position control capability
-        if self.device_data.get("can_use_positions", False):
+        if self.device_data.can_use_positions:
             self._attr_supported_features = CoverEntityFeature.SET_POSITION
         else:
             self._attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open the cover."""
-        if self.device_data.get("can_use_positions", False):
+        if self.device_data.can_use_positions:
             await self._async_set_cover_position(100)
         else:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-                async with session.put(url, json={"position": 100}) as response:
-                    if response.status != 200:
-                        _LOGGER.error("Failed to open cover: %s", response.status)
+            await self.coordinator.async_send_command(self._device_id, {"position": 100})
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close the cover."""
-        if self.device_data.get("can_use_positions", False):
+        if self.device_data.can_use_positions:
             await self._async_set_cover_position(0)
         else:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-                async with session.put(url, json={"position": 0}) as response:
-                    if response.status != 200:
-                        _LOGGER.error("Failed to close cover: %s", response.status)
+            await self.coordinator.async_send_command(self._device_id, {"position": 0})
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"position": -1}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to stop cover: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, {"position": -1})
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
-        if not self.device_data.get("can_use_positions", False):
+        if not self.device_data.can_use_positions:
             _LOGGER.warning("Trying to set position for a blind that doesn't support position control")
             return
             
@@ -92,11 +79,7 @@ class SmartHomeCover(SmartHomeEntity, CoverEntity):
 
     async def _async_set_cover_position(self, position: int) -> None:
         """Helper to set cover position."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"position": position}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to set cover position: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, {"position": position})
 
     @property
     def current_cover_position(self) -> int | None:
@@ -117,9 +100,9 @@ class SmartHomeCover(SmartHomeEntity, CoverEntity):
     @property
     def is_opening(self) -> bool:
         """Return if the cover is opening."""
-        if self.device_data.get("moving", False):
-            if self.device_data.get("can_use_positions", False):
-                return self.device_state.get("position", 0) > self.device_data.get("current_position", 0)
+        if self.device_data.moving:
+            if self.device_data.can_use_positions:
+                return self.device_state.get("position", 0) > self.device_data.current_position
             else:
                 # For non-position blinds, check if moving up
                 return self.device_state.get("position", 0) == 100
@@ -128,9 +111,9 @@ class SmartHomeCover(SmartHomeEntity, CoverEntity):
     @property
     def is_closing(self) -> bool:
         """Return if the cover is closing."""
-        if self.device_data.get("moving", False):
-            if self.device_data.get("can_use_positions", False):
-                return self.device_state.get("position", 0) < self.device_data.get("current_position", 0)
+        if self.device_data.moving:
+            if self.device_data.can_use_positions:
+                return self.device_state.get("position", 0) < self.device_data.current_position
             else:
                 # For non-position blinds, check if moving down
                 return self.device_state.get("position", 0) == 0
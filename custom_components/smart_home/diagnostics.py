@@ -0,0 +1,29 @@
+"""Diagnostics support for Smart Home integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_COORDINATOR
+from .coordinator import SmartHomeDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+
+    return {
+        "setup_timings": coordinator.setup_timings,
+        "stats": coordinator.stats,
+        "devices": len(coordinator._devices),
+        "device_types": {
+            device_type: {module_type: len(device_ids) for module_type, device_ids in modules.items()}
+            for device_type, modules in coordinator._device_index.items()
+        },
+        "effects": len(coordinator.effect_map),
+        "trace": coordinator.tracer.dump() if coordinator.tracer is not None else [],
+    }
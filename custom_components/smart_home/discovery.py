@@ -0,0 +1,88 @@
+"""Discovery and validation of controllers on the network."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import ipaddress
+import re
+import time
+
+import aiohttp
+import async_timeout
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredController:
+    """A controller that answered on its REST API and WebSocket endpoint."""
+
+    host: str
+    port: int
+    devices: int
+    latency_ms: float
+
+    @property
+    def key(self) -> str:
+        """Return the host:port key, also used as config entry unique ID."""
+        return f"{self.host}:{self.port}"
+
+
+def parse_hosts(value: str, max_hosts: int) -> list[str]:
+    """Expand a comma or whitespace separated list of hosts and subnets.
+
+    Raises ValueError for malformed subnets and lists longer than max_hosts.
+    """
+    hosts: list[str] = []
+    for token in re.split(r"[\s,]+", value.strip()):
+        if not token:
+            continue
+        if "/" in token:
+            network = ipaddress.ip_network(token, strict=False)
+            if network.num_addresses > max_hosts + 2:
+                raise ValueError(f"Subnet {token} is too large")
+            hosts += [str(address) for address in network.hosts()]
+        else:
+            hosts.append(token)
+        if len(hosts) > max_hosts:
+            raise ValueError(f"More than {max_hosts} hosts")
+    return list(dict.fromkeys(hosts))
+
+
+async def async_probe_controller(
+    session: aiohttp.ClientSession, host: str, port: int, timeout: float
+) -> DiscoveredController | None:
+    """Return the controller at host:port if /api/devices and /ws both work."""
+    url = f"http://{host}:{port}"
+    try:
+        async with async_timeout.timeout(timeout):
+            start = time.monotonic()
+            async with session.get(f"{url}/api/devices") as response:
+                if response.status != 200:
+                    return None
+                devices = await response.json()
+            latency = time.monotonic() - start
+            async with session.ws_connect(f"ws://{host}:{port}/ws"):
+                pass
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None
+
+    if not isinstance(devices, list):
+        return None
+    return DiscoveredController(host, port, len(devices), round(latency * 1000, 1))
+
+
+async def async_discover_controllers(
+    session: aiohttp.ClientSession,
+    hosts: list[str],
+    port: int,
+    timeout: float,
+    concurrency: int,
+) -> list[DiscoveredController]:
+    """Probe hosts concurrently, at most concurrency at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_probe(host: str) -> DiscoveredController | None:
+        async with semaphore:
+            return await async_probe_controller(session, host, port, timeout)
+
+    results = await asyncio.gather(*(_async_probe(host) for host in hosts))
+    return [controller for controller in results if controller is not None]
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import logging
+import time
+from typing import Any
 
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -9,6 +11,9 @@ from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, Device
 
 from .const import DOMAIN
 from .coordinator import SmartHomeDataUpdateCoordinator
+from .models import SmartHomeDevice
+from .profiler import SECTION_ENTITY_UPDATE
+from .trace import TRACE_STATE_WRITTEN
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,20 +25,46 @@ class SmartHomeEntity(CoordinatorEntity):
     _attr_has_entity_name = True
     _attr_name = None
 
+    # Fingerprint of the last state written to hass
+    _fingerprint: tuple[Any, ...] | None = None
+
     def __init__(
         self,
         coordinator: SmartHomeDataUpdateCoordinator,
         device_id: str,
+        port_name: str | None = None,
+        unique_id_suffix: str = "",
     ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self._device_id = device_id
-        _LOGGER.debug("Initialized entity %s", self.device_data["name"])
+        self._port_name = port_name
+        self._unique_id_suffix = unique_id_suffix
+        if port_name is not None:
+            self._attr_name = port_name.replace("_", " ").title()
+        self._device: SmartHomeDevice = coordinator._devices[device_id]
+        self._async_update_metadata()
+        _LOGGER.debug("Initialized entity %s %s", self._device.name, port_name or "")
+
+    @callback
+    def _async_update_metadata(self) -> None:
+        """Compute unique ID and device info from the current device record."""
+        device = self._device
+        # Each port of a digital module is exposed as its own device
+        identifier = device.uuid if self._port_name is None else f"{device.uuid}_{self._port_name}"
+        self._attr_unique_id = identifier + self._unique_id_suffix
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, identifier)},
+            name=device.name,
+            manufacturer="casaIT",
+            model=device.device_type.replace("_", " ").title(),
+            via_device=(DOMAIN, self.coordinator.entry_id),
+        )
 
     @property
-    def device_data(self) -> dict:
+    def device_data(self) -> SmartHomeDevice:
         """Get device data."""
-        return self.coordinator._devices[self._device_id]
+        return self._device
 
     @property
     def device_state(self) -> dict:
@@ -43,25 +74,63 @@ class SmartHomeEntity(CoordinatorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self._device_id in self.coordinator._devices
+        return (
+            self.coordinator.last_update_success
+            and self.coordinator.controller_available
+            and self._device_id in self.coordinator._devices
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of this device when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(self._device_id, self._handle_coordinator_update)
+        )
+        # Remember the fingerprint of the initial state written on add
+        self._fingerprint = self._state_fingerprint()
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return a fingerprint of the inputs the exposed state is derived from.
+
+        State, unit, name and attributes all derive from the device record and
+        its cached state. Both are replaced rather than mutated, so comparing
+        them is cheap and no state property is evaluated twice on a write.
+        Entities with other inputs add them in an override.
+        """
+        return (self.available, self._device, self.device_state)
+
+    @callback
+    def _async_write_ha_state_if_changed(self) -> None:
+        """Write the state to hass unless it matches the last written state."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._fingerprint:
+            self.coordinator.stats["state_writes_skipped"] += 1
+            return
+        self._fingerprint = fingerprint
+        self.coordinator.stats["state_writes"] += 1
+        self.async_write_ha_state()
+        tracer = self.coordinator.tracer
+        if tracer is not None and tracer.current is not None:
+            tracer.add(tracer.current, TRACE_STATE_WRITTEN, self._device_id, {"entity_id": self.entity_id})
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        # Device records are replaced only when their metadata changed
+        device = self.coordinator._devices.get(self._device_id, self._device)
+        if device is not self._device:
+            self._device = device
+            self._async_update_metadata()
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID to use for this entity."""
-        return self.device_data["uuid"]
+        profiler = self.coordinator.profiler
+        if profiler is None:
+            self._async_write_ha_state_if_changed()
+            return
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this WLED device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.unique_id)},
-            name=self.device_data["name"],
-            manufacturer="casaIT",
-            model=self.device_data["device_type"].replace("_", " ").title(),
-            via_device=(DOMAIN, self.coordinator.entry_id),
+        start = time.perf_counter()
+        self._async_write_ha_state_if_changed()
+        profiler.add(
+            SECTION_ENTITY_UPDATE,
+            time.perf_counter() - start,
+            entity_class=type(self).__name__,
         )
@@ -0,0 +1,64 @@
+"""Support for Smart Home pushbutton events."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.event import EventDeviceClass, EventEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, DATA_COORDINATOR, PRESS_TYPES
+from .coordinator import SmartHomeDataUpdateCoordinator
+from .entity import SmartHomeEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Smart Home pushbutton events."""
+    coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+
+    entities = []
+    for module_type, device_ids in coordinator.devices_by_type("pushbutton").items():
+        for device_id in device_ids:
+            if module_type == "digital":
+                # Create two event entities for port A and B
+                entities.append(SmartHomePushbuttonEvent(coordinator, device_id, "port_a"))
+                entities.append(SmartHomePushbuttonEvent(coordinator, device_id, "port_b"))
+            else:
+                entities.append(SmartHomePushbuttonEvent(coordinator, device_id))
+
+    async_add_entities(entities)
+
+class SmartHomePushbuttonEvent(SmartHomeEntity, EventEntity):
+    """Representation of presses of a Smart Home pushbutton."""
+
+    _attr_device_class = EventDeviceClass.BUTTON
+    _attr_event_types = PRESS_TYPES
+
+    def __init__(
+        self,
+        coordinator: SmartHomeDataUpdateCoordinator,
+        device_id: str,
+        port_name: str | None = None,
+    ) -> None:
+        """Initialize the event entity."""
+        super().__init__(coordinator, device_id, port_name, unique_id_suffix="_event")
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to presses when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_press_listener(self._device_id, self._port_name, self._async_handle_press)
+        )
+
+    @callback
+    def _async_handle_press(self, press_type: str) -> None:
+        """Handle a detected press."""
+        self._trigger_event(press_type)
+        # Every press is a new event, even when the device state is unchanged
+        self.async_write_ha_state()
@@ -0,0 +1,156 @@
+"""Groups of controller lights and switches driven as one entity."""
+from __future__ import annotations
+
+from typing import Any
+import uuid
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .coordinator import SmartHomeDataUpdateCoordinator
+from .models import SmartHomeDevice
+
+CONF_ID = "id"
+CONF_DEVICES = "devices"
+CONF_AREA = "area"
+
+PORTS = ("port_a", "port_b")
+
+# Device types that can be members of a group
+GROUP_DEVICE_TYPES = ("rgb_led", "dimmer", "switch")
+
+GROUP_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional(CONF_ID): cv.string,
+        vol.Required(CONF_NAME): cv.string,
+        vol.Exclusive(CONF_DEVICES, "members"): [vol.Coerce(str)],
+        vol.Exclusive(CONF_AREA, "members"): cv.string,
+    }),
+    cv.has_at_least_one_key(CONF_DEVICES, CONF_AREA),
+)
+
+GROUPS_SCHEMA = vol.All(list, [GROUP_SCHEMA])
+
+def assign_group_ids(
+    groups: list[dict[str, Any]], previous: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Return the groups with a unique, stable ID each.
+
+    The entity unique ID is derived from the ID, so renaming a group keeps its
+    entity. Groups saved before IDs existed keep their slugified name, which
+    their entities already use. New and duplicated groups get a UUID.
+    """
+    legacy = {slugify(group[CONF_NAME]) for group in previous if CONF_ID not in group}
+    seen: set[str] = set()
+    assigned: list[dict[str, Any]] = []
+    for group in groups:
+        group_id = group.get(CONF_ID)
+        if group_id is None and slugify(group[CONF_NAME]) in legacy:
+            group_id = slugify(group[CONF_NAME])
+        if group_id is None or group_id in seen:
+            group_id = uuid.uuid4().hex
+        seen.add(group_id)
+        assigned.append({**group, CONF_ID: group_id})
+    return assigned
+
+
+def group_id(config: dict[str, Any]) -> str:
+    """Return the ID of a group, the slugified name if it has none yet."""
+    return config.get(CONF_ID) or slugify(config[CONF_NAME])
+
+
+# A device ID and, for digital modules, the port
+GroupMember = tuple[str, str | None]
+
+
+@callback
+def async_area_members(
+    hass: HomeAssistant, coordinator: SmartHomeDataUpdateCoordinator, area_id: str
+) -> list[GroupMember]:
+    """Return the devices and ports of a controller assigned to an area."""
+    device_ids = {device.uuid: device_id for device_id, device in coordinator._devices.items()}
+    registry = dr.async_get(hass)
+    members: list[GroupMember] = []
+    for entry in dr.async_entries_for_area(registry, area_id):
+        for domain, identifier in entry.identifiers:
+            if domain != DOMAIN:
+                continue
+            # Ports of digital modules are registered as devices of their own
+            port = next((port for port in PORTS if identifier.endswith(f"_{port}")), None)
+            uuid = identifier[: -len(port) - 1] if port else identifier
+            if uuid in device_ids:
+                members.append((device_ids[uuid], port))
+    return members
+
+
+@callback
+def async_resolve_members(
+    hass: HomeAssistant, coordinator: SmartHomeDataUpdateCoordinator, config: dict[str, Any]
+) -> list[GroupMember]:
+    """Return the members of a group from its device list or area.
+
+    Devices are given as "<id>" or "<id>:<port>". Areas are resolved through
+    the device registry once, on setup of the entry.
+    """
+    members: list[GroupMember] = []
+    if CONF_DEVICES in config:
+        for spec in config[CONF_DEVICES]:
+            device_id, _, port = spec.partition(":")
+            members.append((device_id, port or None))
+    else:
+        members = async_area_members(hass, coordinator, config[CONF_AREA])
+
+    resolved: list[GroupMember] = []
+    for device_id, port in members:
+        device = coordinator._devices.get(device_id)
+        if device is None or device.device_type not in GROUP_DEVICE_TYPES:
+            continue
+        # A digital module without a port joins the group with both ports
+        if device.module_type == "digital" and port is None:
+            resolved += [(device_id, port) for port in PORTS]
+        elif (device_id, port) not in resolved:
+            resolved.append((device_id, port))
+    return resolved
+
+
+def member_is_dimmable(device: SmartHomeDevice) -> bool:
+    """Return whether a member has a brightness."""
+    return device.device_type in ("rgb_led", "dimmer")
+
+
+def member_state(
+    device: SmartHomeDevice, state: dict[str, Any], port: str | None
+) -> tuple[bool, int | None]:
+    """Return whether a member is on and its brightness between 0..255."""
+    if device.device_type == "dimmer":
+        value = state.get("value") or 0
+        return value > 0, int(value * 255 / 100)
+    if device.device_type == "rgb_led":
+        return bool(state.get("state")), int(state.get("brightness") or 0)
+    if device.module_type == "digital":
+        return bool((state.get("multistate") or {}).get(port or "port_a")), None
+    return bool(state.get("state")), None
+
+
+def member_command(
+    device: SmartHomeDevice, port: str | None, turn_on: bool, brightness: int | None
+) -> dict[str, Any]:
+    """Return the PUT payload that switches a member, brightness is 0..255."""
+    if device.device_type == "dimmer":
+        if not turn_on:
+            return {"value": 0}
+        return {"value": round(brightness * 100 / 255) if brightness is not None else 100}
+    if device.device_type == "rgb_led":
+        command: dict[str, Any] = {"state": turn_on}
+        if turn_on and brightness is not None:
+            command["brightness"] = brightness
+        return command
+    if device.module_type == "digital":
+        return {port or "port_a": turn_on}
+    return {"state": turn_on}
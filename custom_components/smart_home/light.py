@@ -1,44 +1,45 @@
 """Support for Smart Home RGB lights."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
 import logging
-import async_timeout
-import aiohttp
+from typing import Any
+
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_EFFECT,
     ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
     ColorMode,
     LightEntity,
     LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.const import CONF_NAME
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, DATA_COORDINATOR
+from .const import CONF_GROUPS, DOMAIN, DATA_COORDINATOR
 from .coordinator import SmartHomeDataUpdateCoordinator
 from .entity import SmartHomeEntity
+from .group import (
+    CONF_AREA,
+    GROUP_SCHEMA,
+    GroupMember,
+    async_resolve_members,
+    group_id,
+    member_command,
+    member_is_dimmable,
+    member_state,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_fetch_effects(api_url: str) -> dict:
-    """Fetch available effects from API."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with async_timeout.timeout(10):
-                async with session.get(f"{api_url}/api/effects") as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        raise HomeAssistantError(f"Failed to fetch effects: {response.status}")
-    except Exception as e:
-        raise HomeAssistantError(f"Error fetching effects: {e}")
-    return {}
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -47,21 +48,27 @@ async def async_setup_entry(
     """Set up Smart Home RGB lights."""
     coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
-    try:
-        # Fetch available effects from API
-        effect_map = await async_fetch_effects(coordinator.api_url)
-        _LOGGER.debug("Fetched effects: %s", effect_map)
-
-        entities = []
-        for device_id, device in coordinator._devices.items():
-            if device["device_type"] == "rgb_led":
-                entities.append(SmartHomeLight(coordinator, device_id, effect_map))
-            elif device["device_type"] == "dimmer":
-                entities.append(SmartHomeDimmerLight(coordinator, device_id))
+    entities = []
+    for device_ids in coordinator.devices_by_type("rgb_led").values():
+        for device_id in device_ids:
+            entities.append(SmartHomeLight(coordinator, device_id))
+    for device_ids in coordinator.devices_by_type("dimmer").values():
+        for device_id in device_ids:
+            entities.append(SmartHomeDimmerLight(coordinator, device_id))
+    for config in entry.options.get(CONF_GROUPS, []):
+        config = GROUP_SCHEMA(config)
+        members = async_resolve_members(hass, coordinator, config)
+        # Area groups pick up members when devices move into the area later
+        if not members and CONF_AREA not in config:
+            _LOGGER.warning("Group %s has no light or switch members", config[CONF_NAME])
+            continue
+        entities.append(
+            SmartHomeGroupLight(
+                coordinator, group_id(config), config[CONF_NAME], members, config.get(CONF_AREA)
+            )
+        )
 
-        async_add_entities(entities)
-    except HomeAssistantError as e:
-        _LOGGER.error("Failed to set up RGB lights: %s", e)
+    async_add_entities(entities)
 
 
 class SmartHomeLight(SmartHomeEntity, LightEntity):
@@ -71,12 +78,10 @@ class SmartHomeLight(SmartHomeEntity, LightEntity):
         self,
         coordinator: SmartHomeDataUpdateCoordinator,
         device_id: str,
-        effect_map: dict[str, str],
     ) -> None:
         """Initialize the light."""
         super().__init__(coordinator, device_id)
-        self._effect_map = effect_map
-        self._attr_supported_features |= LightEntityFeature.EFFECT
+        self._attr_supported_features |= LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
 
         # Set up supported features
         self._attr_supported_color_modes = {ColorMode.RGB}
@@ -88,6 +93,15 @@ class SmartHomeLight(SmartHomeEntity, LightEntity):
 
         _LOGGER.debug("Initializing RGB light: %s id %s", device_id, self.unique_id)
 
+    @property
+    def _effect_map(self) -> dict[str, str]:
+        """Return the effects of the controller, empty until they are fetched."""
+        return self.coordinator.effect_map
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Include the effects, which arrive after the light is added."""
+        return (*super()._state_fingerprint(), self._effect_map)
+
     @property
     def is_on(self) -> bool | None:
         """Return true if light is on."""
@@ -143,19 +157,19 @@ class SmartHomeLight(SmartHomeEntity, LightEntity):
             "animation_speed": speed
         }
         _LOGGER.debug("Setting animation speed to %s", speed)
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json=data) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to update LED configuration: %s", response.status)
-                    return
+        await self.coordinator.async_send_command(self._device_id, data)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
+        _LOGGER.debug("Data given in async_turn_on: %s", kwargs)
+        # Effects and palettes are not interpolated, they switch immediately
+        if kwargs.get(ATTR_TRANSITION) and ATTR_EFFECT not in kwargs and "colors" not in kwargs:
+            self._async_fade_on(kwargs)
+            return
+
         data = {
             "state": True
         }
-        _LOGGER.debug("Data given in async_turn_on: %s", kwargs)
         if ATTR_BRIGHTNESS in kwargs:
             brightness = kwargs[ATTR_BRIGHTNESS]
             data["brightness"] = int(brightness)
@@ -190,19 +204,50 @@ class SmartHomeLight(SmartHomeEntity, LightEntity):
                                 list(self._effect_map.keys()))
 
         _LOGGER.debug("Sending data to API: %s", data)
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json=data) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn on light: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, data)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"state": False}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn off light: %s", response.status)
+        if kwargs.get(ATTR_TRANSITION) and self.is_on:
+            brightness = self.brightness or 0
+            # Restore the brightness once off, so turning on again does not stay dark
+            self.coordinator.transitions.async_start(
+                self._device_id,
+                (brightness,),
+                (0,),
+                kwargs[ATTR_TRANSITION],
+                lambda values: {"state": True, "brightness": round(values[0])},
+                final={"state": False, "brightness": brightness},
+            )
+            return
+
+        await self.coordinator.async_send_command(self._device_id, {"state": False})
+
+    @callback
+    def _async_fade_on(self, kwargs: dict[str, Any]) -> None:
+        """Fade brightness and the first colour towards the requested values."""
+        start_brightness = (self.brightness or 0) if self.is_on else 0
+        end_brightness = int(kwargs.get(ATTR_BRIGHTNESS, self.brightness or 255))
+        start_color = self.rgb_color or (255, 255, 255)
+        end_color = tuple(kwargs.get(ATTR_RGB_COLOR, start_color))
+        fade_color = end_color != start_color
+
+        def build(values: tuple[float, ...]) -> dict[str, Any]:
+            """Return the command for interpolated brightness and colour."""
+            data: dict[str, Any] = {"state": True, "brightness": round(values[0])}
+            if fade_color:
+                r, g, b = (round(value) for value in values[1:])
+                # Always maintain 5 colors array, set first color and pad with black
+                data["colors"] = [f"{r:02x}{g:02x}{b:02x}"] + ['000000'] * 4
+            return data
+
+        self.coordinator.transitions.async_start(
+            self._device_id,
+            (start_brightness, *start_color),
+            (end_brightness, *end_color),
+            kwargs[ATTR_TRANSITION],
+            build,
+        )
 
 
 class SmartHomeDimmerLight(SmartHomeEntity, LightEntity):
@@ -219,6 +264,7 @@ class SmartHomeDimmerLight(SmartHomeEntity, LightEntity):
         # Set color modes
         self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
         self._attr_color_mode = ColorMode.BRIGHTNESS
+        self._attr_supported_features = LightEntityFeature.TRANSITION
 
     @property
     def is_on(self) -> bool | None:
@@ -251,16 +297,227 @@ class SmartHomeDimmerLight(SmartHomeEntity, LightEntity):
         else:
             data["value"] = 100
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json=data) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn on light: %s", response.status)
+        if kwargs.get(ATTR_TRANSITION):
+            self._async_fade_value(data["value"], kwargs[ATTR_TRANSITION])
+            return
+        await self.coordinator.async_send_command(self._device_id, data)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"value": 0}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn off light: %s", response.status)
+        if kwargs.get(ATTR_TRANSITION):
+            self._async_fade_value(0, kwargs[ATTR_TRANSITION])
+            return
+        await self.coordinator.async_send_command(self._device_id, {"value": 0})
+
+    @callback
+    def _async_fade_value(self, value: int, transition: float) -> None:
+        """Fade the dimmer value (0-100) to value."""
+        self.coordinator.transitions.async_start(
+            self._device_id,
+            (self.device_state.get("value") or 0,),
+            (value,),
+            transition,
+            lambda values: {"value": round(values[0])},
+        )
+
+
+class SmartHomeGroupLight(CoordinatorEntity, LightEntity):
+    """A group of controller lights and switches switched with concurrent commands.
+
+    Member states are read from the coordinator cache. Each member update
+    only re-aggregates that member, so a group costs O(1) per device update.
+    The members of an area group are resolved again whenever a device moves
+    between areas.
+    """
+
+    _attr_icon = "mdi:lightbulb-group"
+
+    def __init__(
+        self,
+        coordinator: SmartHomeDataUpdateCoordinator,
+        group_id: str,
+        name: str,
+        members: list[GroupMember],
+        area_id: str | None = None,
+    ) -> None:
+        """Initialize the group."""
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = f"{coordinator.entry_id}_group_{group_id}"
+        self._area_id = area_id
+        self._device_unsubs: dict[str, Callable[[], None]] = {}
+        self._written: tuple[Any, ...] | None = None
+        self._async_set_members(members)
+
+    @callback
+    def _async_set_members(self, members: list[GroupMember]) -> None:
+        """Set the members and aggregate their cached states."""
+        self._members = members
+        self._members_by_device: dict[str, list[GroupMember]] = {}
+        for member in members:
+            self._members_by_device.setdefault(member[0], []).append(member)
+
+        devices = self.coordinator._devices
+        if any(member_is_dimmable(devices[device_id]) for device_id, _ in members):
+            self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+            self._attr_color_mode = ColorMode.BRIGHTNESS
+        else:
+            self._attr_supported_color_modes = {ColorMode.ONOFF}
+            self._attr_color_mode = ColorMode.ONOFF
+
+        # Aggregated member state, maintained incrementally
+        self._on_members: set[GroupMember] = set()
+        self._brightness: dict[GroupMember, int] = {}
+        self._brightness_sum = 0
+        for member in members:
+            self._async_update_member(member)
+
+    @callback
+    def _async_update_member(self, member: GroupMember) -> None:
+        """Re-aggregate the cached state of one member."""
+        device_id, port = member
+        device = self.coordinator._devices.get(device_id)
+        if device is None:
+            is_on, brightness = False, None
+        else:
+            is_on, brightness = member_state(
+                device, self.coordinator._device_states.get(device_id, {}), port
+            )
+
+        self._brightness_sum -= self._brightness.pop(member, 0)
+        if is_on:
+            self._on_members.add(member)
+            if brightness is not None:
+                self._brightness[member] = brightness
+                self._brightness_sum += brightness
+        else:
+            self._on_members.discard(member)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of the member devices."""
+        await super().async_added_to_hass()
+        self._async_subscribe_members()
+        self.async_on_remove(self._async_unsubscribe_members)
+        if self._area_id is not None:
+            self.async_on_remove(
+                self.hass.bus.async_listen(
+                    dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_handle_registry_update
+                )
+            )
+        self._written = self._state_tuple()
+
+    @callback
+    def _async_subscribe_members(self) -> None:
+        """Listen for updates of exactly the current member devices."""
+        for device_id in set(self._device_unsubs) - set(self._members_by_device):
+            self._device_unsubs.pop(device_id)()
+        for device_id in self._members_by_device:
+            if device_id not in self._device_unsubs:
+                self._device_unsubs[device_id] = self.coordinator.async_add_device_listener(
+                    device_id, partial(self._handle_device_update, device_id)
+                )
+
+    @callback
+    def _async_unsubscribe_members(self) -> None:
+        """Stop listening for member updates."""
+        for unsub in self._device_unsubs.values():
+            unsub()
+        self._device_unsubs.clear()
+
+    @callback
+    def _async_handle_registry_update(self, event: Event) -> None:
+        """Resolve the members of the area again when a device changed area."""
+        if event.data["action"] == "update" and "area_id" not in event.data.get("changes", {}):
+            return
+        members = async_resolve_members(self.hass, self.coordinator, {CONF_AREA: self._area_id})
+        if members == self._members:
+            return
+        self._async_set_members(members)
+        self._async_subscribe_members()
+        # The member list is part of the state attributes
+        self._written = self._state_tuple()
+        self.async_write_ha_state()
+
+    def _state_tuple(self) -> tuple[Any, ...]:
+        """Return the values the written state depends on."""
+        return (self.available, self.is_on, self.brightness)
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state only if the aggregate changed."""
+        state = self._state_tuple()
+        if state != self._written:
+            self._written = state
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_device_update(self, device_id: str) -> None:
+        """Handle a WebSocket update of one member device."""
+        for member in self._members_by_device[device_id]:
+            self._async_update_member(member)
+        self._async_write_if_changed()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle a full refresh by re-aggregating all members."""
+        for member in self._members:
+            self._async_update_member(member)
+        self._async_write_if_changed()
+
+    @property
+    def available(self) -> bool:
+        """Return if the controller is reachable."""
+        return super().available and self.coordinator.controller_available
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if any member is on."""
+        return bool(self._on_members)
+
+    @property
+    def brightness(self) -> int | None:
+        """Return the mean brightness of the dimmable members that are on."""
+        if self._attr_color_mode != ColorMode.BRIGHTNESS or not self._brightness:
+            return None
+        return round(self._brightness_sum / len(self._brightness))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the member devices."""
+        return {
+            "members": [
+                device_id if port is None else f"{device_id}:{port}"
+                for device_id, port in self._members
+            ]
+        }
+
+    async def _async_switch(self, turn_on: bool, brightness: int | None = None) -> None:
+        """Send the commands of all members concurrently.
+
+        At most MAX_CONCURRENT_COMMANDS are in flight per controller, so large
+        groups take several round trips.
+        """
+        commands: dict[str, dict[str, Any]] = {}
+        for device_id, port in self._members:
+            device = self.coordinator._devices.get(device_id)
+            if device is None:
+                continue
+            # Both ports of a digital module go out in a single command
+            commands.setdefault(device_id, {}).update(
+                member_command(device, port, turn_on, brightness)
+            )
+
+        results = await self.coordinator.async_send_commands(commands)
+        failed = [device_id for device_id, ok in results.items() if not ok]
+        if failed:
+            raise HomeAssistantError(
+                f"Failed to switch {self.name} for devices: {', '.join(failed)}"
+            )
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the group on."""
+        await self._async_switch(True, kwargs.get(ATTR_BRIGHTNESS))
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the group off."""
+        await self._async_switch(False)
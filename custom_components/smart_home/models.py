@@ -0,0 +1,73 @@
+"""Data models for the Smart Home integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import sys
+from typing import Any
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern a frequently repeated string."""
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class SmartHomeDevice:
+    """The fields of a controller device that the platforms use."""
+
+    id: str
+    uuid: str
+    name: str
+    device_type: str
+    module_type: str
+    can_use_positions: bool = False
+    moving: bool = False
+    current_position: int = 0
+    onewire_type: str | None = None
+    onewire_conversion_type: str | None = None
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> SmartHomeDevice:
+        """Create a device from an /api/devices entry."""
+        return cls(
+            id=str(data["id"]),
+            uuid=data["uuid"],
+            name=data["name"],
+            device_type=_intern(data["device_type"]),
+            module_type=_intern(data["module_type"]),
+            can_use_positions=data.get("can_use_positions", False),
+            moving=data.get("moving", False),
+            current_position=data.get("current_position") or 0,
+            onewire_type=_intern(data.get("onewire_type")),
+            onewire_conversion_type=_intern(data.get("onewire_conversion_type")),
+        )
+
+
+def merge_state(state: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a cached device state with a (partial) update applied.
+
+    Nested objects such as ``multistate`` are merged key by key. ``colors`` may
+    be given as a full list, as a list with ``None`` for unchanged slots or as
+    an object mapping slot index to colour.
+    """
+    merged = dict(state)
+    for key, value in delta.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = merge_state(current, value)
+        elif key == "colors" and (
+            isinstance(value, dict) or (isinstance(value, list) and None in value)
+        ):
+            colors = list(current or [])
+            slots = value.items() if isinstance(value, dict) else enumerate(value)
+            for index, color in slots:
+                if color is None:
+                    continue
+                index = int(index)
+                if index >= len(colors):
+                    colors.extend(["000000"] * (index + 1 - len(colors)))
+                colors[index] = color
+            merged[key] = colors
+        else:
+            merged[key] = value
+    return merged
@@ -0,0 +1,90 @@
+"""Short, long and double press detection for pushbuttons."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from homeassistant.core import callback
+
+from .const import (
+    DOUBLE_PRESS_WINDOW,
+    LONG_PRESS_DELAY,
+    PRESS_TYPE_DOUBLE,
+    PRESS_TYPE_LONG,
+    PRESS_TYPE_PRESS,
+    PRESS_TYPE_SHORT,
+)
+
+
+class PushbuttonPressDetector:
+    """Turn pushbutton press and release edges into press events.
+
+    ``press`` is emitted on the press edge itself so reactions need not wait
+    for classification. ``long_press`` is emitted as soon as the button has
+    been held for LONG_PRESS_DELAY, ``double_press`` on the second press edge
+    within DOUBLE_PRESS_WINDOW of a short release, and ``short_press`` once
+    that window has passed without a second press.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_event: Callable[[str], None],
+    ) -> None:
+        """Initialize the detector."""
+        self._loop = loop
+        self._on_event = on_event
+        self._long_timer: asyncio.TimerHandle | None = None
+        self._short_timer: asyncio.TimerHandle | None = None
+        self._consumed = False
+
+    @callback
+    def async_press(self) -> None:
+        """Handle the press edge."""
+        self._on_event(PRESS_TYPE_PRESS)
+
+        if self._short_timer is not None:
+            # Second press within the window after a short release
+            self._short_timer.cancel()
+            self._short_timer = None
+            self._consumed = True
+            self._on_event(PRESS_TYPE_DOUBLE)
+            return
+
+        self._consumed = False
+        self._long_timer = self._loop.call_later(LONG_PRESS_DELAY, self._async_long_press)
+
+    @callback
+    def async_release(self) -> None:
+        """Handle the release edge."""
+        if self._long_timer is not None:
+            self._long_timer.cancel()
+            self._long_timer = None
+
+        if self._consumed:
+            self._consumed = False
+            return
+
+        self._short_timer = self._loop.call_later(DOUBLE_PRESS_WINDOW, self._async_short_press)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel pending timers."""
+        for timer in (self._long_timer, self._short_timer):
+            if timer is not None:
+                timer.cancel()
+        self._long_timer = None
+        self._short_timer = None
+
+    @callback
+    def _async_long_press(self) -> None:
+        """Handle the button being held past the long press delay."""
+        self._long_timer = None
+        self._consumed = True
+        self._on_event(PRESS_TYPE_LONG)
+
+    @callback
+    def _async_short_press(self) -> None:
+        """Handle the double press window passing after a short press."""
+        self._short_timer = None
+        self._on_event(PRESS_TYPE_SHORT)
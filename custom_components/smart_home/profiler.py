@@ -0,0 +1,113 @@
+"""On-demand profiling of the integration hot paths."""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import threading
+from typing import Any
+
+SECTION_WS_DECODE = "ws_decode"
+SECTION_STATE_UPDATE = "state_update"
+SECTION_ENTITY_UPDATE = "entity_update"
+SECTION_COMMAND = "command"
+SECTION_REPLAY_DECODE = "replay_decode"
+SECTION_REPLAY_UPDATE = "replay_update"
+
+# Number of devices and entity classes listed in the summary
+SUMMARY_TOP = 20
+
+
+class _Timing:
+    """Accumulated timing of one section, device or entity class."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Add one measurement."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def format(self, name: str) -> str:
+        """Return a summary table row."""
+        mean = self.total / self.count if self.count else 0.0
+        return (
+            f"{name:<40} {self.count:>8} {self.total * 1000:>12.3f} "
+            f"{mean * 1000:>10.3f} {self.max * 1000:>10.3f}"
+        )
+
+
+class SmartHomeProfiler:
+    """Collect section timings and a cProfile of the event loop.
+
+    The coordinator and entities only call add() while a profiler is attached
+    to the coordinator, so there is no cost outside of a profiling run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self.sections: dict[str, _Timing] = {}
+        self.devices: dict[str, _Timing] = {}
+        self.entity_classes: dict[str, _Timing] = {}
+
+    def start(self) -> None:
+        """Start profiling the calling (event loop) thread."""
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self._profile.disable()
+
+    def add(
+        self,
+        section: str,
+        elapsed: float,
+        device_id: str | None = None,
+        entity_class: str | None = None,
+    ) -> None:
+        """Add the time spent in a section, may be called from any thread."""
+        with self._lock:
+            self.sections.setdefault(section, _Timing()).add(elapsed)
+            if device_id is not None:
+                self.devices.setdefault(device_id, _Timing()).add(elapsed)
+            if entity_class is not None:
+                self.entity_classes.setdefault(entity_class, _Timing()).add(elapsed)
+
+    def summary(self, device_names: dict[str, Any]) -> str:
+        """Return a text summary of the collected timings."""
+        header = f"{'':<40} {'count':>8} {'total ms':>12} {'mean ms':>10} {'max ms':>10}"
+        lines = ["Sections", header]
+        lines += [timing.format(name) for name, timing in sorted(self.sections.items())]
+
+        lines += ["", "Slowest devices", header]
+        for device_id, timing in sorted(
+            self.devices.items(), key=lambda item: item[1].total, reverse=True
+        )[:SUMMARY_TOP]:
+            lines.append(timing.format(f"{device_names.get(device_id, '?')} ({device_id})"))
+
+        lines += ["", "Slowest entity classes", header]
+        for entity_class, timing in sorted(
+            self.entity_classes.items(), key=lambda item: item[1].total, reverse=True
+        )[:SUMMARY_TOP]:
+            lines.append(timing.format(entity_class))
+
+        stats_output = io.StringIO()
+        pstats.Stats(self._profile, stream=stats_output).sort_stats("cumulative").print_stats(SUMMARY_TOP)
+        lines += ["", stats_output.getvalue()]
+        return "\n".join(lines)
+
+    def dump(self, base_path: str, device_names: dict[str, Any]) -> None:
+        """Write the pstats dump and the text summary, does blocking I/O."""
+        self._profile.dump_stats(f"{base_path}.pstats")
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+            file.write(self.summary(device_names))
@@ -0,0 +1,87 @@
+"""Incremental rolling statistics over recent sensor samples."""
+from __future__ import annotations
+
+from collections import deque
+import time
+
+
+class RollingStatistics:
+    """Rolling min, max, mean and rate of change of recent samples.
+
+    At most ``max_samples`` samples no older than ``max_age`` seconds are
+    kept. Every statistic is maintained incrementally: the sum for the mean
+    and monotonic queues for min and max, so adding a sample is amortized O(1).
+    """
+
+    def __init__(self, max_samples: int, max_age: float) -> None:
+        """Initialize the statistics."""
+        self._max_samples = max_samples
+        self._max_age = max_age
+        self._samples: deque[tuple[float, float]] = deque()
+        # Candidates for min/max, values increasing/decreasing from the left
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+
+    def add(self, value: float, now: float | None = None) -> None:
+        """Add a sample."""
+        if now is None:
+            now = time.monotonic()
+        self.evict(now)
+        while len(self._samples) >= self._max_samples:
+            self._pop_oldest()
+
+        sample = (now, value)
+        self._samples.append(sample)
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append(sample)
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append(sample)
+
+    def evict(self, now: float | None = None) -> None:
+        """Drop samples older than max_age, call before reading a quiet series."""
+        if now is None:
+            now = time.monotonic()
+        while self._samples and now - self._samples[0][0] > self._max_age:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        """Drop the oldest sample."""
+        sample = self._samples.popleft()
+        self._sum -= sample[1]
+        if self._min[0] is sample:
+            self._min.popleft()
+        if self._max[0] is sample:
+            self._max.popleft()
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self._samples)
+
+    @property
+    def min(self) -> float | None:
+        """Return the smallest sample."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the largest sample."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        return self._sum / len(self._samples) if self._samples else None
+
+    @property
+    def change_per_hour(self) -> float | None:
+        """Return the change between oldest and newest sample, per hour."""
+        if len(self._samples) < 2:
+            return None
+        (first_time, first_value), (last_time, last_value) = self._samples[0], self._samples[-1]
+        if last_time <= first_time:
+            return None
+        return (last_value - first_value) * 3600 / (last_time - first_time)
@@ -10,15 +10,22 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, DATA_COORDINATOR
+from .const import DOMAIN, DATA_COORDINATOR, STATISTICS_MAX_AGE, STATISTICS_MAX_SAMPLES
 from .coordinator import SmartHomeDataUpdateCoordinator
 from .entity import SmartHomeEntity
+from .rolling import RollingStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
+ATTR_MIN = "min"
+ATTR_MAX = "max"
+ATTR_MEAN = "mean"
+ATTR_CHANGE_PER_HOUR = "change_per_hour"
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -28,68 +35,142 @@ async def async_setup_entry(
     coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
     entities = []
-    for device_id, device in coordinator._devices.items():
-        if device["device_type"] == "sensor":
-            if device.get("onewire_conversion_type") == "DS2438TEMP":
+    for device_ids in coordinator.devices_by_type("sensor").values():
+        for device_id in device_ids:
+            device = coordinator._devices[device_id]
+            if device.onewire_conversion_type == "DS2438TEMP":
                 entities.append(SmartHomeTemperatureSensor(coordinator, device_id))
-            elif device.get("onewire_type") == "DS18XB20":
+            elif device.onewire_type == "DS18XB20":
                 entities.append(SmartHomeTemperatureSensor(coordinator, device_id))
-            elif device.get("onewire_conversion_type") in ["HIH4030", "HIH5030"]:
+            elif device.onewire_conversion_type in ["HIH4030", "HIH5030"]:
                 entities.append(SmartHomeHumiditySensor(coordinator, device_id))
-            elif device.get("onewire_conversion_type") == "TEPT5600":
+            elif device.onewire_conversion_type == "TEPT5600":
                 entities.append(SmartHomeLightSensor(coordinator, device_id))
             else:
                 entities.append(SmartHomeGenericSensor(coordinator, device_id))
+    for device_ids in coordinator.devices_by_type("rgb_led").values():
+        for device_id in device_ids:
+            entities.append(SmartHomePaletteSensor(coordinator, device_id))
 
     async_add_entities(entities)
 
-class SmartHomeTemperatureSensor(SmartHomeEntity, SensorEntity):
-    """Representation of a Smart Home temperature sensor."""
+class SmartHomeSensor(SmartHomeEntity, SensorEntity):
+    """Base class for Smart Home sensors with rolling statistics.
+
+    Min, max, mean and change per hour over the last samples are kept in
+    memory and exposed as attributes, so dashboards and automations need no
+    recorder queries. The attributes are excluded from the recorder. They
+    are recomputed on every coordinator update, so samples also age out of
+    the window while the sensor is quiet (at least every poll interval).
+    """
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "°C"
+    _unrecorded_attributes = frozenset({ATTR_MIN, ATTR_MAX, ATTR_MEAN, ATTR_CHANGE_PER_HOUR})
+
+    def __init__(self, coordinator: SmartHomeDataUpdateCoordinator, device_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_id)
+        self._statistics = RollingStatistics(STATISTICS_MAX_SAMPLES, STATISTICS_MAX_AGE)
+        self._sampled_state: dict[str, Any] | None = None
+        self._attr_extra_state_attributes = None
+
+    async def async_added_to_hass(self) -> None:
+        """Take the first sample when added to hass."""
+        self._async_sample()
+        self._async_update_statistics()
+        await super().async_added_to_hass()
+
+    @callback
+    def _async_sample(self) -> None:
+        """Add the current value to the statistics once per received state."""
+        # Cached states are replaced, never mutated, on every update
+        state = self.device_state
+        if state is self._sampled_state:
+            return
+        self._sampled_state = state
+        value = state.get("value")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self._statistics.add(value)
+
+    @callback
+    def _async_update_statistics(self) -> None:
+        """Drop expired samples and recompute the rounded statistics attributes."""
+        statistics = self._statistics
+        statistics.evict()
+        if not len(statistics):
+            self._attr_extra_state_attributes = None
+            return
+        change = statistics.change_per_hour
+        # Rounded, so float noise of identical readings does not force a write
+        self._attr_extra_state_attributes = {
+            ATTR_MIN: round(statistics.min, 2),
+            ATTR_MAX: round(statistics.max, 2),
+            ATTR_MEAN: round(statistics.mean, 2),
+            ATTR_CHANGE_PER_HOUR: round(change, 2) if change is not None else None,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Sample the new value before writing the state."""
+        self._async_sample()
+        self._async_update_statistics()
+        super()._handle_coordinator_update()
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Include the statistics, which also change when samples expire."""
+        return (*super()._state_fingerprint(), self._attr_extra_state_attributes)
 
     @property
     def native_value(self) -> float | None:
         """Return the sensor value."""
         return self.device_state.get("value")
 
-class SmartHomeHumiditySensor(SmartHomeEntity, SensorEntity):
+class SmartHomeTemperatureSensor(SmartHomeSensor):
+    """Representation of a Smart Home temperature sensor."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = "°C"
+
+class SmartHomeHumiditySensor(SmartHomeSensor):
     """Representation of a Smart Home humidity sensor."""
 
     _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "%"
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the sensor value."""
-        return self.device_state.get("value")
-
-class SmartHomeLightSensor(SmartHomeEntity, SensorEntity):
+class SmartHomeLightSensor(SmartHomeSensor):
     """Representation of a Smart Home light sensor."""
 
     _attr_device_class = SensorDeviceClass.ILLUMINANCE
-    _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "lx"
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the sensor value."""
-        return self.device_state.get("value")
-
-class SmartHomeGenericSensor(SmartHomeEntity, SensorEntity):
+class SmartHomeGenericSensor(SmartHomeSensor):
     """Representation of a Smart Home generic sensor."""
 
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the sensor value."""
-        return self.device_state.get("value")
-
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
         return self.device_state.get("unit")
+
+
+class SmartHomePaletteSensor(SmartHomeEntity, SensorEntity):
+    """Diagnostic sensor with the five-slot colour palette of an RGB light.
+
+    The palette changes far less often than the light's state, so it is kept
+    off the light entity and only written to the recorder when it changes.
+    """
+
+    _attr_name = "Palette"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:palette"
+
+    def __init__(self, coordinator: SmartHomeDataUpdateCoordinator, device_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_id, unique_id_suffix="_palette")
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the palette as comma separated hex colours."""
+        colors = self.device_state.get("colors")
+        if not colors:
+            return None
+        return ",".join(f"#{color.replace('0x', '')}" for color in colors if color)
@@ -1,26 +1,52 @@
-"""Service for adjusting animation speed and colors of RGB lights."""
+"""Services for RGB lights, scene snapshots, state reads, traffic replay and profiling."""
 from __future__ import annotations
 
+import asyncio
+from dataclasses import asdict
+from functools import partial
 import logging
+import time
+from typing import Any
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, DATA_COORDINATOR, DATA_PROFILE_RUN
+from .coordinator import SmartHomeDataUpdateCoordinator
+from .group import async_area_members
+from .profiler import SmartHomeProfiler
+from .traffic import async_replay, read_recording
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_SET_ANIMATION_SPEED = "set_animation_speed"
 SERVICE_SET_COLORS = "set_colors"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_REPLAY = "replay"
+SERVICE_PROFILE = "profile"
+SERVICE_STOP_PROFILE = "stop_profile"
+SERVICE_GET_STATES = "get_states"
 ATTR_SPEED = "speed"
 ATTR_COLOR1 = "color1"
 ATTR_COLOR2 = "color2"
 ATTR_COLOR3 = "color3"
 ATTR_COLOR4 = "color4"
 ATTR_COLOR5 = "color5"
+ATTR_NAME = "name"
+ATTR_FILE = "file"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_DEVICE_TYPE = "device_type"
+ATTR_MODULE_TYPE = "module_type"
+ATTR_AREA = "area"
+ATTR_DEVICE_ID = "device_id"
 
 SERVICE_SCHEMA_ANIMATION_SPEED = vol.Schema({
     vol.Required(ATTR_ENTITY_ID): cv.comp_entity_ids,
@@ -38,12 +64,63 @@ SERVICE_SCHEMA_SET_COLORS = vol.Schema({
     vol.Optional(ATTR_COLOR5): vol.All(list, vol.Length(min=3, max=3)),
 })
 
+SERVICE_SCHEMA_SNAPSHOT = vol.Schema({
+    vol.Required(ATTR_NAME): cv.string,
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+SERVICE_SCHEMA_REPLAY = vol.Schema({
+    vol.Required(ATTR_FILE): cv.string,
+    vol.Optional(ATTR_SPEED, default=1): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+SERVICE_SCHEMA_PROFILE = vol.Schema({
+    vol.Optional(ATTR_DURATION, default=60): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=3600)
+    ),
+})
+
+SERVICE_SCHEMA_STOP_PROFILE = vol.Schema({})
+
+SERVICE_SCHEMA_GET_STATES = vol.Schema({
+    vol.Optional(ATTR_DEVICE_TYPE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MODULE_TYPE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_AREA): cv.string,
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [vol.Coerce(str)]),
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+
+def _replay_done(coordinator: SmartHomeDataUpdateCoordinator, task: asyncio.Task) -> None:
+    """Allow the next replay once a replay has finished."""
+    if coordinator.replay_task is task:
+        coordinator.replay_task = None
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up the Light Animation services."""
 
+    async def _async_finish_profile(_now: Any = None) -> None:
+        """End the profiling run and write its results."""
+        profiler, coordinators, cancel_timer = hass.data.pop(DATA_PROFILE_RUN)
+        cancel_timer()
+        profiler.stop()
+        for coordinator in coordinators:
+            if coordinator.profiler is profiler:
+                coordinator.profiler = None
+
+        device_names = {
+            device_id: device.name
+            for coordinator in coordinators
+            for device_id, device in coordinator._devices.items()
+        }
+        base_path = hass.config.path(f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}")
+        await hass.async_add_executor_job(profiler.dump, base_path, device_names)
+        _LOGGER.info("Wrote profile to %s.pstats and %s.txt", base_path, base_path)
+
     # Register services
-    async def service_handler(call: ServiceCall) -> None:
+    async def service_handler(call: ServiceCall) -> ServiceResponse:
         """Handle the services."""
         if call.service == SERVICE_SET_ANIMATION_SPEED:
             # Get all light entities from the call
@@ -85,6 +162,117 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                         entity_id
                     )
 
+        elif call.service == SERVICE_SNAPSHOT:
+            for entry_id, entry_data in hass.data[DOMAIN].items():
+                if call.data.get(ATTR_CONFIG_ENTRY_ID, entry_id) == entry_id:
+                    await entry_data[DATA_COORDINATOR].snapshots.async_snapshot(call.data[ATTR_NAME])
+
+        elif call.service == SERVICE_RESTORE:
+            name = call.data[ATTR_NAME]
+            # Controllers added after the snapshot was taken do not have it
+            snapshots = [
+                entry_data[DATA_COORDINATOR].snapshots
+                for entry_id, entry_data in hass.data[DOMAIN].items()
+                if call.data.get(ATTR_CONFIG_ENTRY_ID, entry_id) == entry_id
+            ]
+            snapshots = [store for store in snapshots if await store.async_has_snapshot(name)]
+            if not snapshots:
+                raise HomeAssistantError(f"Unknown snapshot: {name}")
+            for store in snapshots:
+                await store.async_restore(name)
+
+        elif call.service == SERVICE_REPLAY:
+            path = hass.config.path(call.data[ATTR_FILE])
+            if not await hass.async_add_executor_job(hass.config.is_allowed_path, path):
+                raise HomeAssistantError(f"Access to {path} is not allowed")
+            try:
+                records = await hass.async_add_executor_job(read_recording, path)
+            except (OSError, ValueError) as error:
+                raise HomeAssistantError(f"Failed to read recording {path}: {error}") from error
+
+            coordinators = {
+                entry_id: entry_data[DATA_COORDINATOR]
+                for entry_id, entry_data in hass.data[DOMAIN].items()
+                if call.data.get(ATTR_CONFIG_ENTRY_ID, entry_id) == entry_id
+            }
+            if any(coordinator.replay_task is not None for coordinator in coordinators.values()):
+                raise HomeAssistantError("A traffic replay is already in progress")
+
+            # Replays can run for as long as the recording, do not hold up the caller
+            for entry_id, coordinator in coordinators.items():
+                task = hass.async_create_background_task(
+                    async_replay(coordinator, records, call.data[ATTR_SPEED]),
+                    f"{DOMAIN} {entry_id} traffic replay",
+                )
+                coordinator.replay_task = task
+                task.add_done_callback(partial(_replay_done, coordinator))
+
+        elif call.service == SERVICE_PROFILE:
+            if DATA_PROFILE_RUN in hass.data:
+                raise HomeAssistantError("A profiling run is already in progress")
+            coordinators = [entry_data[DATA_COORDINATOR] for entry_data in hass.data[DOMAIN].values()]
+
+            profiler = SmartHomeProfiler()
+            try:
+                profiler.start()
+            except ValueError as error:
+                # Another profiler is already active on this thread
+                raise HomeAssistantError(f"Failed to start profiling: {error}") from error
+            for coordinator in coordinators:
+                coordinator.profiler = profiler
+            # Return right away, the run ends on its own or through stop_profile
+            hass.data[DATA_PROFILE_RUN] = (
+                profiler,
+                coordinators,
+                async_call_later(hass, call.data[ATTR_DURATION], _async_finish_profile),
+            )
+
+        elif call.service == SERVICE_STOP_PROFILE:
+            if DATA_PROFILE_RUN not in hass.data:
+                raise HomeAssistantError("No profiling run is in progress")
+            await _async_finish_profile()
+
+        elif call.service == SERVICE_GET_STATES:
+            now = time.monotonic()
+            devices = []
+            for entry_id, entry_data in hass.data[DOMAIN].items():
+                if call.data.get(ATTR_CONFIG_ENTRY_ID, entry_id) != entry_id:
+                    continue
+                coordinator = entry_data[DATA_COORDINATOR]
+
+                # Narrow down with the device type index before checking each device
+                if ATTR_DEVICE_TYPE in call.data:
+                    device_ids = [
+                        device_id
+                        for device_type in call.data[ATTR_DEVICE_TYPE]
+                        for module_device_ids in coordinator.devices_by_type(device_type).values()
+                        for device_id in module_device_ids
+                    ]
+                else:
+                    device_ids = list(coordinator._devices)
+                if ATTR_DEVICE_ID in call.data:
+                    wanted = set(call.data[ATTR_DEVICE_ID])
+                    device_ids = [device_id for device_id in device_ids if device_id in wanted]
+                if ATTR_AREA in call.data:
+                    in_area = {
+                        device_id
+                        for device_id, _ in async_area_members(hass, coordinator, call.data[ATTR_AREA])
+                    }
+                    device_ids = [device_id for device_id in device_ids if device_id in in_area]
+
+                for device_id in device_ids:
+                    device = coordinator._devices[device_id]
+                    if ATTR_MODULE_TYPE in call.data and device.module_type not in call.data[ATTR_MODULE_TYPE]:
+                        continue
+                    updated = coordinator._device_state_times.get(device_id)
+                    devices.append({
+                        **asdict(device),
+                        "config_entry_id": entry_id,
+                        "state": coordinator._device_states.get(device_id, {}),
+                        "state_age": round(now - updated, 1) if updated is not None else None,
+                    })
+            return {"devices": devices}
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_ANIMATION_SPEED,
@@ -99,8 +287,57 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SERVICE_SCHEMA_SET_COLORS,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        service_handler,
+        schema=SERVICE_SCHEMA_SNAPSHOT,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        service_handler,
+        schema=SERVICE_SCHEMA_SNAPSHOT,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY,
+        service_handler,
+        schema=SERVICE_SCHEMA_REPLAY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        service_handler,
+        schema=SERVICE_SCHEMA_PROFILE,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILE,
+        service_handler,
+        schema=SERVICE_SCHEMA_STOP_PROFILE,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATES,
+        service_handler,
+        schema=SERVICE_SCHEMA_GET_STATES,
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 async def async_unload_services(hass: HomeAssistant) -> None:
     # Unregister services
     hass.services.async_remove(DOMAIN, SERVICE_SET_ANIMATION_SPEED)
     hass.services.async_remove(DOMAIN, SERVICE_SET_COLORS)
+    hass.services.async_remove(DOMAIN, SERVICE_SNAPSHOT)
+    hass.services.async_remove(DOMAIN, SERVICE_RESTORE)
+    hass.services.async_remove(DOMAIN, SERVICE_REPLAY)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+    hass.services.async_remove(DOMAIN, SERVICE_STOP_PROFILE)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_STATES)
@@ -0,0 +1,130 @@
+"""Scene snapshots stored from the coordinator's cached device states."""
+from __future__ import annotations
+
+import logging
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION
+from .models import SmartHomeDevice
+
+if TYPE_CHECKING:
+    from .coordinator import SmartHomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# State keys that can be sent back to the controller, per device type
+RGB_LED_FIELDS = ("state", "brightness", "colors", "animation")
+
+
+def state_to_command(device: SmartHomeDevice, state: dict[str, Any]) -> dict[str, Any] | None:
+    """Convert a cached device state into the PUT payload that reproduces it."""
+    if not state:
+        return None
+
+    device_type = device.device_type
+    if device_type == "switch":
+        if device.module_type == "digital":
+            multistate = state.get("multistate")
+            if not multistate:
+                return None
+            return {port: multistate[port] for port in ("port_a", "port_b") if port in multistate}
+        if "state" not in state:
+            return None
+        return {"state": state["state"]}
+
+    if device_type == "dimmer":
+        if "value" not in state:
+            return None
+        return {"value": state["value"]}
+
+    if device_type == "rgb_led":
+        command = {key: state[key] for key in RGB_LED_FIELDS if key in state}
+        return command or None
+
+    if device_type == "blind":
+        position = state.get("position")
+        if position is None or position == -1:
+            return None
+        return {"position": position}
+
+    return None
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, dict[str, dict[str, Any]]]]:
+    """Return the store holding the snapshots of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshots")
+
+
+async def async_remove_snapshots(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored snapshots of a deleted config entry."""
+    await _snapshot_store(hass, entry_id).async_remove()
+
+
+class SmartHomeSnapshots:
+    """Create and restore snapshots of all controllable devices of one controller."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartHomeDataUpdateCoordinator) -> None:
+        """Initialize the snapshot store."""
+        self._coordinator = coordinator
+        self._store = _snapshot_store(hass, coordinator.entry_id)
+        self._snapshots: dict[str, dict[str, dict[str, Any]]] | None = None
+
+    async def _async_load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Load snapshots from storage on first use."""
+        if self._snapshots is None:
+            self._snapshots = await self._store.async_load() or {}
+        return self._snapshots
+
+    async def async_snapshot(self, name: str) -> int:
+        """Store the current state of every controllable device under name."""
+        snapshots = await self._async_load()
+        coordinator = self._coordinator
+
+        snapshot = {}
+        for device_id, device in coordinator._devices.items():
+            command = state_to_command(device, coordinator._device_states.get(device_id, {}))
+            if command is not None:
+                snapshot[device_id] = command
+
+        snapshots[name] = snapshot
+        await self._store.async_save(snapshots)
+        _LOGGER.debug("Stored snapshot %s with %d devices", name, len(snapshot))
+        return len(snapshot)
+
+    async def async_has_snapshot(self, name: str) -> bool:
+        """Return whether a snapshot is stored under name."""
+        return name in await self._async_load()
+
+    async def async_restore(self, name: str) -> int:
+        """Restore a snapshot, only sending commands to devices that differ."""
+        snapshots = await self._async_load()
+        if name not in snapshots:
+            raise HomeAssistantError(f"Unknown snapshot: {name}")
+
+        coordinator = self._coordinator
+        commands = {}
+        for device_id, target in snapshots[name].items():
+            device = coordinator._devices.get(device_id)
+            if device is None:
+                continue
+            current = state_to_command(device, coordinator._device_states.get(device_id, {})) or {}
+            diff = {key: value for key, value in target.items() if current.get(key) != value}
+            if diff:
+                commands[device_id] = diff
+
+        _LOGGER.debug(
+            "Restoring snapshot %s: %d of %d devices differ",
+            name, len(commands), len(snapshots[name]),
+        )
+        if commands:
+            results = await coordinator.async_send_commands(commands)
+            failed = [device_id for device_id, ok in results.items() if not ok]
+            if failed:
+                raise HomeAssistantError(
+                    f"Failed to restore snapshot {name} for devices: {', '.join(failed)}"
+                )
+        return len(commands)
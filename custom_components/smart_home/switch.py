@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import aiohttp
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -25,14 +24,15 @@ async def async_setup_entry(
     coordinator: SmartHomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
     entities = []
-    for device_id, device in coordinator._devices.items():
-        if device["device_type"] in ["switch", "pushbutton"]:
-            if device["module_type"] == "digital":
-                # Create two switches for port A and B
-                entities.append(SmartHomeDigitalSwitch(coordinator, device_id, "port_a"))
-                entities.append(SmartHomeDigitalSwitch(coordinator, device_id, "port_b"))
-            else:
-                entities.append(SmartHomeSwitch(coordinator, device_id))
+    for device_type in ["switch", "pushbutton"]:
+        for module_type, device_ids in coordinator.devices_by_type(device_type).items():
+            for device_id in device_ids:
+                if module_type == "digital":
+                    # Create two switches for port A and B
+                    entities.append(SmartHomeDigitalSwitch(coordinator, device_id, "port_a"))
+                    entities.append(SmartHomeDigitalSwitch(coordinator, device_id, "port_b"))
+                else:
+                    entities.append(SmartHomeSwitch(coordinator, device_id))
 
     async_add_entities(entities)
 
@@ -41,19 +41,11 @@ class SmartHomeSwitch(SmartHomeEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"state": True}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn on switch: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, {"state": True})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json={"state": False}) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn off switch: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, {"state": False})
 
     @property
     def is_on(self) -> bool | None:
@@ -64,17 +56,6 @@ class SmartHomeSwitch(SmartHomeEntity, SwitchEntity):
 class SmartHomeDigitalSwitch(SmartHomeEntity, SwitchEntity):
     """Representation of a Smart Home digital switch."""
 
-    def __init__(self, coordinator, device_id, port_name):
-        super().__init__(coordinator, device_id)
-        self._port_name = port_name
-        self._attr_name = port_name.replace("_", " ").title()
-        _LOGGER.debug("Initialized switch digital switch %s port %s", self.device_data["name"], self.name)
-
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID to use for this entity."""
-        return self.device_data["uuid"] + "_" + self._port_name
-
     @property
     def is_on(self) -> bool | None:
         """Return if the switch is on."""
@@ -94,11 +75,7 @@ class SmartHomeDigitalSwitch(SmartHomeEntity, SwitchEntity):
         else:
             state["port_b"] = True
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json=state) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn on switch: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, state)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
@@ -109,8 +86,4 @@ class SmartHomeDigitalSwitch(SmartHomeEntity, SwitchEntity):
         else:
             state["port_b"] = False
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.coordinator.api_url}/api/devices/{self._device_id}/state"
-            async with session.put(url, json=state) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to turn off switch: %s", response.status)
+        await self.coordinator.async_send_command(self._device_id, state)
@@ -0,0 +1,71 @@
+"""Sampled, structured trace events of the WebSocket and command paths."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import itertools
+import random
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+TRACE_FRAME_RECEIVED = "frame_received"
+TRACE_DISPATCHED = "dispatched"
+TRACE_STATE_WRITTEN = "state_written"
+TRACE_COMMAND_SENT = "command_sent"
+TRACE_COMMAND_ACKED = "command_acked"
+TRACE_COMMAND_FAILED = "command_failed"
+
+
+class SmartHomeTracer:
+    """Keep the most recent sampled trace events in a bounded buffer.
+
+    The sampling decision is taken once per frame or command, and every event
+    of that chain carries the same trace ID. Events of unsampled chains cost a
+    single None check, so tracing can stay enabled in production.
+    """
+
+    def __init__(
+        self, size: int, sample_rate: float, device_ids: Iterable[str] | None = None
+    ) -> None:
+        """Initialize the tracer."""
+        self._events: deque[tuple[float, int, str, str | None, dict[str, Any] | None]] = deque(
+            maxlen=size
+        )
+        self._sample_rate = sample_rate
+        self._device_ids = frozenset(device_ids) if device_ids else None
+        self._trace_ids = itertools.count(1)
+        # Trace of the frame being dispatched on the event loop, if sampled
+        self.current: int | None = None
+
+    def start(self, device_id: str | None) -> int | None:
+        """Return a new trace ID if a chain for the device is sampled, thread-safe."""
+        if self._device_ids is not None and device_id not in self._device_ids:
+            return None
+        if self._sample_rate < 1 and random.random() >= self._sample_rate:
+            return None
+        return next(self._trace_ids)
+
+    def add(
+        self,
+        trace_id: int,
+        event: str,
+        device_id: str | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """Add an event of a sampled chain, thread-safe."""
+        self._events.append((time.time(), trace_id, event, device_id, details))
+
+    def dump(self) -> list[dict[str, Any]]:
+        """Return the buffered events, oldest first."""
+        return [
+            {
+                "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                "trace": trace_id,
+                "event": event,
+                "device_id": device_id,
+                **(details or {}),
+            }
+            for timestamp, trace_id, event, device_id, details in list(self._events)
+        ]
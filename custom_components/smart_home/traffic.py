@@ -0,0 +1,168 @@
+"""Recording and replay of controller traffic for offline profiling."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, TYPE_CHECKING
+
+from .models import SmartHomeDevice, merge_state
+from .profiler import SECTION_REPLAY_DECODE, SECTION_REPLAY_UPDATE
+
+if TYPE_CHECKING:
+    from .coordinator import SmartHomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD_WS = "ws"
+RECORD_REST = "rest"
+
+# Yield to the event loop every this many records when replaying at full speed
+REPLAY_YIELD_INTERVAL = 100
+
+
+class TrafficRecorder:
+    """Append timestamped controller traffic to a size-limited rotating file.
+
+    Each line is a compact JSON array ``[timestamp, kind, payload]`` where kind
+    is ``ws`` for a raw WebSocket frame and ``rest`` for a device list
+    snapshot. This does blocking file I/O and must not be called from the
+    event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = None
+        self._closed = False
+
+    def record(self, kind: str, payload: Any) -> None:
+        """Append a single record, does nothing once the recorder is closed."""
+        line = json.dumps([round(time.time(), 4), kind, payload], separators=(",", ":")) + "\n"
+        with self._lock:
+            # The WebSocket thread may still hold the recorder after it was closed
+            if self._closed:
+                return
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            if self._file.tell() >= self._max_bytes:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        """Rotate the recording, keeping backup_count older files."""
+        self._file.close()
+        self._file = None
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self._backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self) -> None:
+        """Close the recording file for good."""
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_recording(path: str) -> list[tuple[float, str, Any]]:
+    """Read a recording written by TrafficRecorder, skipping corrupt lines."""
+    records = []
+    skipped = 0
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                timestamp, kind, payload = json.loads(line)
+            except ValueError:
+                # A truncated last line or a line with the wrong shape
+                skipped += 1
+                continue
+            records.append((timestamp, kind, payload))
+    if skipped:
+        _LOGGER.warning("Skipped %d corrupt lines in recording %s", skipped, path)
+    return records
+
+
+def _apply_frame(
+    devices: dict[str, SmartHomeDevice],
+    states: dict[str, dict[str, Any]],
+    msg: dict[str, Any],
+) -> str | None:
+    """Apply a WebSocket message to a device cache, returning the updated device."""
+    if msg["type"] in ("device_update", "device_delta"):
+        device_id = str(msg["device_id"])
+        if device_id in devices:
+            states[device_id] = merge_state(states.get(device_id, {}), msg["state"])
+            return device_id
+    elif msg["type"] == "initial_states":
+        for state in msg["states"]:
+            states[str(state["device_id"])] = state["state"]
+    return None
+
+
+async def async_replay(
+    coordinator: SmartHomeDataUpdateCoordinator,
+    records: list[tuple[float, str, Any]],
+    speed: float,
+) -> None:
+    """Feed recorded traffic through a detached copy of the ingestion path.
+
+    speed scales the recorded timing (1 = real time, 10 = ten times faster),
+    0 replays as fast as possible. Frames are decoded and merged into a
+    private copy of the device cache, timed by the coordinator's profiler
+    while a profiling run is active. Nothing reaches the live cache, the
+    entities, the event bus or the controller, and live updates keep flowing
+    while a replay runs.
+    """
+    devices = dict(coordinator._devices)
+    states = dict(coordinator._device_states)
+
+    start = time.monotonic()
+    previous = None
+    skipped = 0
+    for index, (timestamp, kind, payload) in enumerate(records):
+        if speed and previous is not None and timestamp > previous:
+            await asyncio.sleep((timestamp - previous) / speed)
+        elif not speed and index % REPLAY_YIELD_INTERVAL == 0:
+            await asyncio.sleep(0)
+        previous = timestamp
+
+        profiler = coordinator.profiler
+        frame_start = time.perf_counter()
+        try:
+            if kind == RECORD_WS:
+                msg = json.loads(payload)
+                decoded = time.perf_counter()
+                device_id = _apply_frame(devices, states, msg)
+                if profiler is not None:
+                    profiler.add(SECTION_REPLAY_DECODE, decoded - frame_start)
+                    profiler.add(SECTION_REPLAY_UPDATE, time.perf_counter() - decoded, device_id)
+            elif kind == RECORD_REST:
+                devices = {
+                    str(data["id"]): SmartHomeDevice.from_api(data)
+                    for data in payload
+                    if data["enabled"]
+                }
+        except (ValueError, KeyError, TypeError):
+            # A frame that does not parse or has the wrong shape
+            skipped += 1
+
+    _LOGGER.info(
+        "Replayed %d records in %.3fs, skipped %d corrupt frames",
+        len(records), time.monotonic() - start, skipped,
+    )
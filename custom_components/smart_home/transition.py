@@ -0,0 +1,165 @@
+"""Client-side light transitions with a bounded command rate."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import TRANSITION_MAX_STEPS_PER_SECOND, TRANSITION_TICK
+
+if TYPE_CHECKING:
+    from .coordinator import SmartHomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Fade:
+    """Interpolation of one device between two sets of values."""
+
+    __slots__ = (
+        "device_id", "start", "end", "start_time", "duration", "build", "final",
+        "last_step", "last_command", "task",
+    )
+
+    def __init__(
+        self,
+        device_id: str,
+        start: tuple[float, ...],
+        end: tuple[float, ...],
+        start_time: float,
+        duration: float,
+        build: Callable[[tuple[float, ...]], dict[str, Any]],
+        final: dict[str, Any] | None,
+    ) -> None:
+        """Initialize the fade."""
+        self.device_id = device_id
+        self.start = start
+        self.end = end
+        self.start_time = start_time
+        self.duration = duration
+        self.build = build
+        self.final = final
+        self.last_step = 0.0
+        self.last_command: dict[str, Any] | None = None
+        self.task: asyncio.Task | None = None
+
+    def command(self, now: float) -> tuple[dict[str, Any], bool]:
+        """Return the command for the current time and whether the fade is done."""
+        progress = min(1.0, (now - self.start_time) / self.duration)
+        if progress >= 1 and self.final is not None:
+            return self.final, True
+        values = tuple(a + (b - a) * progress for a, b in zip(self.start, self.end))
+        return self.build(values), progress >= 1
+
+
+class TransitionEngine:
+    """Fade the lights of one controller on a single shared timer.
+
+    Every tick sends at most TRANSITION_MAX_STEPS_PER_SECOND * TRANSITION_TICK
+    steps, picking finished fades first and then the devices that waited
+    longest. With many fading devices each one steps less often, but the
+    controller never sees more than the budgeted request rate. A device never
+    has more than one step in flight. Each sent step is merged into the cached
+    state, so a following fade or command starts from the last sent values.
+    """
+
+    def __init__(self, coordinator: SmartHomeDataUpdateCoordinator) -> None:
+        """Initialize the transition engine."""
+        self._coordinator = coordinator
+        self._loop = coordinator.hass.loop
+        self._fades: dict[str, _Fade] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        # Steps in flight, cancelled when the engine stops
+        self._tasks: set[asyncio.Task] = set()
+        self._budget = max(1, int(TRANSITION_MAX_STEPS_PER_SECOND * TRANSITION_TICK))
+
+    @callback
+    def async_start(
+        self,
+        device_id: str,
+        start: tuple[float, ...],
+        end: tuple[float, ...],
+        duration: float,
+        build: Callable[[tuple[float, ...]], dict[str, Any]],
+        final: dict[str, Any] | None = None,
+    ) -> None:
+        """Fade a device from start to end, replacing a running fade.
+
+        build turns interpolated values into a command, final (if given) is
+        sent instead of the end values once the fade is done.
+        """
+        previous = self._fades.get(device_id)
+        fade = _Fade(device_id, start, end, self._loop.time(), duration, build, final)
+        if previous is not None:
+            fade.task = previous.task
+        self._fades[device_id] = fade
+        if self._timer is None:
+            self._async_tick()
+
+    @callback
+    def async_cancel(self, device_id: str) -> asyncio.Task | None:
+        """Stop the fade of a device, returning its step still in flight."""
+        fade = self._fades.pop(device_id, None)
+        if fade is None or fade.task is None or fade.task.done():
+            return None
+        return fade.task
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop all fades and cancel their steps in flight."""
+        self._fades.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    @callback
+    def _async_tick(self) -> None:
+        """Send the next steps within the budget."""
+        self._timer = None
+        now = self._loop.time()
+
+        ready = [
+            fade for fade in self._fades.values() if fade.task is None or fade.task.done()
+        ]
+        ready.sort(key=lambda fade: (now < fade.start_time + fade.duration, fade.last_step))
+
+        sent = 0
+        for fade in ready:
+            if sent >= self._budget:
+                break
+            command, done = fade.command(now)
+            if done:
+                del self._fades[fade.device_id]
+            fade.last_step = now
+            # Quantized values often repeat between ticks of slow fades
+            if command == fade.last_command:
+                continue
+            fade.last_command = command
+            fade.task = self._coordinator.hass.async_create_task(self._async_step(fade, command))
+            self._tasks.add(fade.task)
+            fade.task.add_done_callback(self._tasks.discard)
+            sent += 1
+
+        if self._fades:
+            self._timer = self._loop.call_later(TRANSITION_TICK, self._async_tick)
+
+    async def _async_step(self, fade: _Fade, command: dict[str, Any]) -> None:
+        """Send one step, ending the fade if the controller rejects it."""
+        coordinator = self._coordinator
+        coordinator.stats["transition_steps"] += 1
+        try:
+            await coordinator._async_put_state(fade.device_id, command)
+        except HomeAssistantError as error:
+            _LOGGER.warning("Stopping transition of device %s: %s", fade.device_id, error)
+            if self._fades.get(fade.device_id) is fade:
+                del self._fades[fade.device_id]
+            return
+        # The echo of the step may lag behind, start the next fade from what was sent
+        coordinator._async_assume_state(fade.device_id, command)